@@ -0,0 +1,273 @@
+# Micrograd, vectorized.
+# Same idea as the scalar Value class from part1_micrograd.ipynb, but every node
+# holds a whole NumPy array. One graph node now covers a full matrix multiply or
+# a full batch, so backward() walks a handful of nodes instead of millions of scalars.
+
+import numpy as np
+
+
+def _unbroadcast(grad, shape):
+    """Sums `grad` back down to `shape`, undoing NumPy broadcasting."""
+    while grad.ndim > len(shape):
+        grad = grad.sum(axis=0)
+    for axis, size in enumerate(shape):
+        if size == 1 and grad.shape[axis] != 1:
+            grad = grad.sum(axis=axis, keepdims=True)
+    return grad
+
+
+class Tensor:
+
+    def __init__(self, data, _children=(), _op='', dtype=np.float32):
+        self.data = np.asarray(data, dtype=dtype)
+        self.grad = np.zeros_like(self.data)
+        self._backward = lambda: None
+        self._prev = _children
+        self._op = _op
+
+    def __repr__(self):
+        return f"Tensor(shape={self.data.shape}, op={self._op!r})"
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    # --- Elementwise ---
+    def __add__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other, dtype=self.data.dtype)
+        out = Tensor(self.data + other.data, (self, other), '+', self.data.dtype)
+
+        def _backward():
+            self.grad += _unbroadcast(out.grad, self.shape)
+            other.grad += _unbroadcast(out.grad, other.shape)
+        out._backward = _backward
+        return out
+
+    def __mul__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other, dtype=self.data.dtype)
+        out = Tensor(self.data * other.data, (self, other), '*', self.data.dtype)
+
+        def _backward():
+            self.grad += _unbroadcast(other.data * out.grad, self.shape)
+            other.grad += _unbroadcast(self.data * out.grad, other.shape)
+        out._backward = _backward
+        return out
+
+    def __pow__(self, power):
+        assert isinstance(power, (int, float)), "only supporting int/float powers"
+        out = Tensor(self.data ** power, (self,), f'**{power}', self.data.dtype)
+
+        def _backward():
+            self.grad += power * self.data ** (power - 1) * out.grad
+        out._backward = _backward
+        return out
+
+    def __neg__(self):
+        return self * -1
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __truediv__(self, other):
+        return self * other ** -1
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __rtruediv__(self, other):
+        return Tensor(other, dtype=self.data.dtype) / self
+
+    def relu(self):
+        out = Tensor(np.maximum(self.data, 0), (self,), 'relu', self.data.dtype)
+
+        def _backward():
+            self.grad += (self.data > 0) * out.grad
+        out._backward = _backward
+        return out
+
+    def tanh(self):
+        t = np.tanh(self.data)
+        out = Tensor(t, (self,), 'tanh', self.data.dtype)
+
+        def _backward():
+            self.grad += (1 - t ** 2) * out.grad
+        out._backward = _backward
+        return out
+
+    def exp(self):
+        e = np.exp(self.data)
+        out = Tensor(e, (self,), 'exp', self.data.dtype)
+
+        def _backward():
+            self.grad += e * out.grad
+        out._backward = _backward
+        return out
+
+    def log(self):
+        out = Tensor(np.log(self.data), (self,), 'log', self.data.dtype)
+
+        def _backward():
+            self.grad += out.grad / self.data
+        out._backward = _backward
+        return out
+
+    # --- Linear algebra and reductions ---
+    def __matmul__(self, other):
+        out = Tensor(self.data @ other.data, (self, other), '@', self.data.dtype)
+
+        def _backward():
+            self.grad += out.grad @ other.data.T
+            other.grad += self.data.T @ out.grad
+        out._backward = _backward
+        return out
+
+    def sum(self, axis=None, keepdims=False):
+        out = Tensor(self.data.sum(axis=axis, keepdims=keepdims), (self,), 'sum', self.data.dtype)
+
+        def _backward():
+            grad = out.grad
+            if axis is not None and not keepdims:
+                grad = np.expand_dims(grad, axis)
+            self.grad += np.broadcast_to(grad, self.shape)
+        out._backward = _backward
+        return out
+
+    def mean(self, axis=None, keepdims=False):
+        count = self.data.size if axis is None else np.prod([self.shape[a] for a in np.atleast_1d(axis)])
+        return self.sum(axis=axis, keepdims=keepdims) * (1.0 / count)
+
+    def cross_entropy(self, labels):
+        """Mean softmax cross-entropy of logits (batch, classes) against integer labels."""
+        labels = np.asarray(labels)
+        shifted = self.data - self.data.max(axis=1, keepdims=True)
+        log_probs = shifted - np.log(np.exp(shifted).sum(axis=1, keepdims=True))
+        n = len(labels)
+        out = Tensor(-log_probs[np.arange(n), labels].mean(), (self,), 'cross_entropy', self.data.dtype)
+
+        def _backward():
+            grad = np.exp(log_probs)
+            grad[np.arange(n), labels] -= 1
+            self.grad += grad * (out.grad / n)
+        out._backward = _backward
+        return out
+
+    # --- Backpropagation ---
+    def backward(self):
+        # Iterative topological sort (the graph can be deeper than the recursion limit)
+        topo = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                topo.append(node)
+                continue
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            stack.append((node, True))
+            for child in node._prev:
+                if id(child) not in visited:
+                    stack.append((child, False))
+
+        self.grad = np.ones_like(self.data)
+        for node in reversed(topo):
+            node._backward()
+
+
+# --- Neural Network Building Blocks ---
+
+class Module:
+
+    def zero_grad(self):
+        for p in self.parameters():
+            p.grad = np.zeros_like(p.data)
+
+    def parameters(self):
+        return []
+
+
+class Linear(Module):
+
+    def __init__(self, nin, nout, nonlin=True, rng=None):
+        rng = rng or np.random.default_rng()
+        # He initialization keeps ReLU activations from shrinking layer by layer
+        self.w = Tensor(rng.standard_normal((nin, nout)) * np.sqrt(2.0 / nin))
+        self.b = Tensor(np.zeros((1, nout)))
+        self.nonlin = nonlin
+
+    def __call__(self, x):
+        out = x @ self.w + self.b
+        return out.relu() if self.nonlin else out
+
+    def parameters(self):
+        return [self.w, self.b]
+
+    def __repr__(self):
+        return f"{'ReLU' if self.nonlin else 'Linear'}Layer({self.w.shape[0]}, {self.w.shape[1]})"
+
+
+class MLP(Module):
+
+    def __init__(self, nin, nouts, seed=None):
+        rng = np.random.default_rng(seed)
+        sizes = [nin] + nouts
+        self.layers = [
+            Linear(sizes[i], sizes[i + 1], nonlin=i != len(nouts) - 1, rng=rng)
+            for i in range(len(nouts))
+        ]
+
+    def __call__(self, x):
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+    def parameters(self):
+        return [p for layer in self.layers for p in layer.parameters()]
+
+    def __repr__(self):
+        return f"MLP of [{', '.join(str(layer) for layer in self.layers)}]"
+
+
+def make_blobs(n_samples=60_000, n_features=20, n_classes=4, seed=0):
+    """Synthetic classification dataset: one Gaussian blob per class."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_classes, n_features)) * 2
+    labels = rng.integers(0, n_classes, n_samples)
+    x = centers[labels] + rng.standard_normal((n_samples, n_features))
+    return x.astype(np.float32), labels
+
+
+def train(model, x, y, epochs=3, batch_size=256, lr=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        order = rng.permutation(len(x))
+        for start in range(0, len(x), batch_size):
+            batch = order[start:start + batch_size]
+            loss = model(Tensor(x[batch])).cross_entropy(y[batch])
+
+            model.zero_grad()
+            loss.backward()
+            for p in model.parameters():
+                p.data -= lr * p.grad
+
+        accuracy = (model(Tensor(x)).data.argmax(axis=1) == y).mean()
+        print(f"epoch {epoch + 1}: loss {loss.data:.4f}, accuracy {accuracy:.2%}")
+
+
+if __name__ == "__main__":
+    import time
+
+    x, y = make_blobs()
+    model = MLP(x.shape[1], [64, 64, 4], seed=0)
+    print(model)
+
+    start = time.perf_counter()
+    train(model, x, y)
+    print(f"Trained on {len(x):,} samples in {time.perf_counter() - start:.2f}s")
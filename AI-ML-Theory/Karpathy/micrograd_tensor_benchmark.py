@@ -0,0 +1,195 @@
+# Compares the scalar Value-per-node micrograd (as built in part1_micrograd.ipynb)
+# with the array-backed Tensor engine from micrograd_tensor.py.
+# Both run forward + backward + SGD step of the same MLP with cross-entropy loss.
+# The scalar engine only runs on a small slice; its time is extrapolated to the full set.
+#
+# Usage:
+#   python micrograd_tensor_benchmark.py [scalar_samples]
+
+import math
+import random
+import sys
+import time
+
+from micrograd_tensor import MLP, Tensor, make_blobs
+
+
+# --- Scalar Engine (one graph node per number) ---
+
+class Value:
+
+    def __init__(self, data, _children=(), _op=''):
+        self.data = data
+        self.grad = 0.0
+        self._backward = lambda: None
+        self._prev = set(_children)
+        self._op = _op
+
+    def __add__(self, other):
+        other = other if isinstance(other, Value) else Value(other)
+        out = Value(self.data + other.data, (self, other), '+')
+
+        def _backward():
+            self.grad += out.grad
+            other.grad += out.grad
+        out._backward = _backward
+        return out
+
+    def __mul__(self, other):
+        other = other if isinstance(other, Value) else Value(other)
+        out = Value(self.data * other.data, (self, other), '*')
+
+        def _backward():
+            self.grad += other.data * out.grad
+            other.grad += self.data * out.grad
+        out._backward = _backward
+        return out
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return self * -1
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def relu(self):
+        out = Value(max(self.data, 0.0), (self,), 'relu')
+
+        def _backward():
+            self.grad += (out.data > 0) * out.grad
+        out._backward = _backward
+        return out
+
+    def exp(self):
+        out = Value(math.exp(self.data), (self,), 'exp')
+
+        def _backward():
+            self.grad += out.data * out.grad
+        out._backward = _backward
+        return out
+
+    def log(self):
+        out = Value(math.log(self.data), (self,), 'log')
+
+        def _backward():
+            self.grad += out.grad / self.data
+        out._backward = _backward
+        return out
+
+    def backward(self):
+        topo = []
+        visited = set()
+
+        def build_topo(v):
+            if v not in visited:
+                visited.add(v)
+                for child in v._prev:
+                    build_topo(child)
+                topo.append(v)
+        build_topo(self)
+
+        self.grad = 1.0
+        for v in reversed(topo):
+            v._backward()
+
+
+class ScalarLayer:
+
+    def __init__(self, nin, nout, nonlin, rng):
+        scale = math.sqrt(2.0 / nin)
+        self.w = [[Value(rng.gauss(0, scale)) for _ in range(nin)] for _ in range(nout)]
+        self.b = [Value(0.0) for _ in range(nout)]
+        self.nonlin = nonlin
+
+    def __call__(self, x):
+        outs = []
+        for w_row, b in zip(self.w, self.b):
+            act = sum((wi * xi for wi, xi in zip(w_row, x)), b)
+            outs.append(act.relu() if self.nonlin else act)
+        return outs
+
+    def parameters(self):
+        return [w for row in self.w for w in row] + self.b
+
+
+class ScalarMLP:
+
+    def __init__(self, nin, nouts, seed=0):
+        rng = random.Random(seed)
+        sizes = [nin] + nouts
+        self.layers = [
+            ScalarLayer(sizes[i], sizes[i + 1], i != len(nouts) - 1, rng)
+            for i in range(len(nouts))
+        ]
+
+    def __call__(self, x):
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+    def parameters(self):
+        return [p for layer in self.layers for p in layer.parameters()]
+
+
+def scalar_cross_entropy(logits, label):
+    # Shift by the max for numerical stability (a constant, so no gradient needed)
+    shift = max(v.data for v in logits)
+    exps = [(v - shift).exp() for v in logits]
+    return sum(exps[1:], exps[0]).log() - (logits[label] - shift)
+
+
+# --- Benchmark ---
+
+def time_scalar(x, y, sizes, batch_size=32, lr=0.05):
+    model = ScalarMLP(x.shape[1], sizes)
+    rows = [[float(v) for v in row] for row in x]
+    labels = [int(v) for v in y]
+
+    start = time.perf_counter()
+    for b in range(0, len(rows), batch_size):
+        losses = [
+            scalar_cross_entropy(model(rows[i]), labels[i])
+            for i in range(b, min(b + batch_size, len(rows)))
+        ]
+        loss = sum(losses[1:], losses[0]) * (1.0 / len(losses))
+        for p in model.parameters():
+            p.grad = 0.0
+        loss.backward()
+        for p in model.parameters():
+            p.data -= lr * p.grad
+    return time.perf_counter() - start
+
+
+def time_tensor(x, y, sizes, batch_size=32, lr=0.05):
+    model = MLP(x.shape[1], sizes, seed=0)
+
+    start = time.perf_counter()
+    for b in range(0, len(x), batch_size):
+        loss = model(Tensor(x[b:b + batch_size])).cross_entropy(y[b:b + batch_size])
+        model.zero_grad()
+        loss.backward()
+        for p in model.parameters():
+            p.data -= lr * p.grad
+    return time.perf_counter() - start
+
+
+def main():
+    scalar_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    sizes = [64, 64, 4]
+    x, y = make_blobs()
+    print(f"MLP {x.shape[1]} -> {sizes}, {len(x):,} samples, batch 32, one epoch\n")
+
+    scalar = time_scalar(x[:scalar_samples], y[:scalar_samples], sizes)
+    scalar_full = scalar * len(x) / scalar_samples
+    print(f"scalar Value : {scalar:8.3f}s for {scalar_samples} samples "
+          f"(~{scalar_full:,.0f}s extrapolated to {len(x):,})")
+
+    tensor = time_tensor(x, y, sizes)
+    print(f"Tensor       : {tensor:8.3f}s for {len(x):,} samples")
+    print(f"speedup      : ~{scalar_full / tensor:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
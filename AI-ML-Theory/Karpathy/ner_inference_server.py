@@ -0,0 +1,241 @@
+# Long-lived local inference service for the NER pipeline from part1_micrograd.py.
+# The model is loaded once. Concurrent callers submit single texts and get a
+# Future back; a background worker groups waiting requests into micro-batches
+# (up to max_batch_size, or whatever arrived within max_wait_ms) and runs them
+# through the model in one call.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+DEFAULT_MODEL = "Jean-Baptiste/roberta-large-ner-english"
+
+
+# --- Model Loading ---
+
+def load_ner_pipeline(model_name_or_path=DEFAULT_MODEL, quantize=False, batch_size=32):
+    """
+    Builds the token-classification pipeline once.
+    With quantize=True the Linear layers are converted to int8 with PyTorch
+    dynamic quantization (CPU only).
+    """
+    import torch
+    from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name_or_path)
+    model = AutoModelForTokenClassification.from_pretrained(model_name_or_path)
+    model.eval()
+    if quantize:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return pipeline(
+        "token-classification",
+        model=model,
+        tokenizer=tokenizer,
+        device=-1 if quantize else None,
+        batch_size=batch_size,
+    )
+
+
+def save_tiny_ner_model(path):
+    """
+    Saves a tiny randomly initialised BERT token classifier and tokenizer to `path`.
+    Useful as an offline stand-in for the real model (outputs are meaningless).
+    """
+    import os
+    from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast
+
+    os.makedirs(path, exist_ok=True)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("abcdefghijklmnopqrstuvwxyz")
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(vocab))
+
+    labels = ["O", "PER", "LOC"]
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=64,
+        id2label=dict(enumerate(labels)),
+        label2id={label: i for i, label in enumerate(labels)},
+    )
+    BertForTokenClassification(config).save_pretrained(path)
+    BertTokenizerFast(vocab_file=vocab_file).save_pretrained(path)
+    return path
+
+
+# --- Dynamic Batching Server ---
+
+class BatchingInferenceServer:
+
+    def __init__(self, predict_batch, max_batch_size=32, max_wait_ms=5.0):
+        """
+        `predict_batch` takes a list of inputs and returns a list of results
+        in the same order (a transformers pipeline called on a list does this).
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = None
+        # Guards start/stop against submit(), so nothing is queued behind the shutdown marker
+        self._lifecycle_lock = threading.Lock()
+        self._accepting = False
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = []
+        self._batch_latencies = []
+        self._started_at = None
+
+    # --- Lifecycle ---
+    def start(self):
+        with self._lifecycle_lock:
+            if self._worker is None:
+                self._started_at = time.perf_counter()
+                self._worker = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+                self._worker.start()
+                self._accepting = True
+        return self
+
+    def stop(self):
+        with self._lifecycle_lock:
+            if self._worker is None or not self._accepting:
+                return
+            self._accepting = False
+            self._queue.put(None)
+        self._worker.join()
+        # Anything still queued will never be served: fail it instead of leaving callers waiting
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None and request[1].set_running_or_notify_cancel():
+                self._deliver(request[1], exception=RuntimeError("Server stopped"))
+        with self._lifecycle_lock:
+            self._worker = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Client API ---
+    def submit(self, item):
+        """Queues one input and returns a Future with its result."""
+        future = Future()
+        with self._lifecycle_lock:
+            if not self._accepting:
+                raise RuntimeError("Server is not running; call start() first")
+            self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout)
+
+    # --- Worker ---
+    def _collect_batch(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Put the shutdown marker back so the main loop sees it after this batch
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            # Drop requests whose caller already cancelled; the rest can no longer be cancelled
+            batch = [(item, future) for item, future in self._collect_batch(first)
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+
+            start = time.perf_counter()
+            try:
+                results = list(self.predict_batch(items))
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"predict_batch returned {len(results)} results for {len(batch)} inputs"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    self._deliver(future, exception=e)
+                continue
+            elapsed = time.perf_counter() - start
+
+            for (_, future), result in zip(batch, results):
+                self._deliver(future, result=result)
+            with self._stats_lock:
+                self._batch_sizes.append(len(batch))
+                self._batch_latencies.append(elapsed)
+
+    @staticmethod
+    def _deliver(future, result=None, exception=None):
+        # A failure to resolve one future must never take down the worker thread
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            # Resolved elsewhere in the meantime
+            pass
+
+    def stats(self):
+        """Per-batch latency and overall throughput since start()."""
+        with self._stats_lock:
+            sizes = list(self._batch_sizes)
+            latencies = sorted(self._batch_latencies)
+        if not sizes:
+            return {"batches": 0, "requests": 0}
+        uptime = time.perf_counter() - self._started_at
+        return {
+            "batches": len(sizes),
+            "requests": sum(sizes),
+            "mean_batch_size": sum(sizes) / len(sizes),
+            "p50_batch_latency_ms": latencies[len(latencies) // 2] * 1000,
+            "p99_batch_latency_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            "throughput_per_s": sum(sizes) / uptime,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    from concurrent.futures import ThreadPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Run the batching NER server on a few names.")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--tiny", metavar="DIR", help="save and use a tiny offline stand-in model in DIR")
+    parser.add_argument("--quantize", action="store_true", help="int8 dynamic quantization (CPU)")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model_path = save_tiny_ner_model(args.tiny) if args.tiny else args.model
+    start = time.perf_counter()
+    classifier = load_ner_pipeline(model_path, quantize=args.quantize, batch_size=args.max_batch_size)
+    print(f"Model loaded in {time.perf_counter() - start:.2f}s")
+
+    names = ["Hans Mueller", "Giorgi Duchidze", "Marie Curie", "Ada Lovelace"] * 64
+    with BatchingInferenceServer(classifier, args.max_batch_size, args.max_wait_ms) as server:
+        with ThreadPoolExecutor(max_workers=64) as clients:
+            results = list(clients.map(server, names))
+        print(results[0])
+        print(server.stats())
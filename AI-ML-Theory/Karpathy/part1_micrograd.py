@@ -1,4 +1,6 @@
 # ვარიანტი 1 – nationality classification
+# For many concurrent names use ner_inference_server.py: it loads the model
+# once and batches requests instead of classifying one name per call.
 from transformers import pipeline
 
 # classifier = pipeline(
@@ -6,10 +8,11 @@ from transformers import pipeline
 #     model="indigo-ai/BERTino-nationality-classifier"
 # )
 
-classifier = pipeline(
-    "token-classification",
-    model="Jean-Baptiste/roberta-large-ner-english"
-)
+if __name__ == "__main__":
+    classifier = pipeline(
+        "token-classification",
+        model="Jean-Baptiste/roberta-large-ner-english"
+    )
 
-result = classifier("Hans Mueller")
-# → {"label": "Germany", "score": 0.91}
\ No newline at end of file
+    result = classifier("Hans Mueller")
+    # → {"label": "Germany", "score": 0.91}
@@ -1,13 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Initialize the Language Model
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", temperature=0)
+import lazy
 
 # --- Prompt 1: Extract Information ---
 prompt_extract = ChatPromptTemplate.from_template(
@@ -20,22 +14,37 @@ prompt_transform = ChatPromptTemplate.from_template(
     "'cpu', 'memory', and 'storage' as keys:\n\n{specifications}"
 )
 
-# Converts LLM output to a plain string
-extraction_chain = prompt_extract | llm | StrOutputParser()
 
-# Full chain: extraction → transformation
-full_chain = (
-    {"specifications": extraction_chain}
-    | prompt_transform
-    | llm
-    | StrOutputParser()
-)
+def build_chains(extract_llm, transform_llm=None):
+    """
+    Returns (extraction_chain, full_chain).
+    A separate model can be passed for the transformation stage.
+    """
+    transform_llm = transform_llm or extract_llm
 
-input_text = (
-    "The new laptop model features a 3.5 GHz octa-core processor, "
-    "16GB of RAM, and a 1TB NVMe SSD."
-)
+    # Converts LLM output to a plain string
+    extraction_chain = prompt_extract | extract_llm | StrOutputParser()
+
+    # Full chain: extraction → transformation
+    full_chain = (
+        {"specifications": extraction_chain}
+        | prompt_transform
+        | transform_llm
+        | StrOutputParser()
+    )
+    return extraction_chain, full_chain
+
+
+if __name__ == "__main__":
+    # Initialize the Language Model (loads .env on first use)
+    llm = lazy.gemini("gemini-2.0-flash-lite", temperature=0)
+    extraction_chain, full_chain = build_chains(llm)
+
+    input_text = (
+        "The new laptop model features a 3.5 GHz octa-core processor, "
+        "16GB of RAM, and a 1TB NVMe SSD."
+    )
 
-final_result = full_chain.invoke({"text_input": input_text})
+    final_result = full_chain.invoke({"text_input": input_text})
 
-print(final_result)
+    print(final_result)
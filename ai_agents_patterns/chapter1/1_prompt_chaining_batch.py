@@ -0,0 +1,260 @@
+import asyncio
+import importlib
+import json
+import os
+import time
+from typing import Iterator, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+
+# The chain definitions live in 1_prompt_chaining.py (not a valid identifier for `import`)
+prompt_chaining = importlib.import_module("1_prompt_chaining")
+
+_DONE = object()
+
+
+# --- Input / Checkpoint ---
+
+def read_jsonl(path: str, skip: int = 0) -> Iterator[tuple[int, Optional[dict]]]:
+    """Lazily yields (line_index, record), skipping the first `skip` lines. Blank lines give None."""
+    with open(path) as f:
+        for index, line in enumerate(f):
+            if index >= skip:
+                yield index, json.loads(line) if line.strip() else None
+
+
+def load_checkpoint(path: Optional[str]) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"offset": 0, "output_bytes": 0, "parts": 0, "failed": []}
+
+
+def save_checkpoint(path: Optional[str], state: dict) -> None:
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)  # atomic: a crash leaves either the old or the new checkpoint
+
+
+# --- Output Writers ---
+# Results are written in input order, so "offset" in the checkpoint always means
+# "every line before this one is safely on disk".
+
+class JsonlWriter:
+    def __init__(self, path: str, checkpoint: dict):
+        self.path = path
+        mode = "r+" if os.path.exists(path) else "w"
+        self._file = open(path, mode)
+        # Drop anything written after the last checkpoint (it will be redone)
+        self._file.truncate(checkpoint.get("output_bytes", 0))
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, row: dict) -> None:
+        self._file.write(json.dumps(row) + "\n")
+
+    def flush(self, state: dict) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        state["output_bytes"] = self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes one part-NNNNN.parquet file into the `path` directory per flush."""
+
+    def __init__(self, path: str, checkpoint: dict):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("Parquet output requires `pip install pyarrow`") from e
+        self.path = path
+        self.parts = checkpoint.get("parts", 0)
+        self._rows = []
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("part-") and int(name[5:10]) >= self.parts:
+                os.remove(os.path.join(path, name))
+
+    def write(self, row: dict) -> None:
+        self._rows.append({**row, "input": json.dumps(row["input"])})
+
+    def flush(self, state: dict) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._rows:
+            table = pa.Table.from_pylist(self._rows)
+            pq.write_table(table, os.path.join(self.path, f"part-{self.parts:05d}.parquet"))
+            self.parts += 1
+            self._rows = []
+        state["parts"] = self.parts
+
+    def close(self) -> None:
+        pass
+
+
+# --- Two-Stage Pipelined Runner ---
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    llm: BaseChatModel,
+    max_in_flight: int = 32,
+    checkpoint_path: Optional[str] = None,
+    flush_every: int = 500,
+    output_format: str = "jsonl",
+    text_field: str = "text_input",
+    retry_failed: bool = True,
+) -> dict:
+    """
+    Streams every record of `input_path` through extract → transform.
+    Stage 1 and stage 2 run as separate worker pools connected by a queue,
+    so different records are in different stages at the same time.
+    One semaphore caps the number of model requests in flight across both stages.
+
+    Failed records are written with their error and listed in the checkpoint's
+    "failed"; with `retry_failed` a resumed run processes them again and appends
+    a new row for each one that now succeeds (the last row for an index wins).
+    """
+    extraction_chain, _ = prompt_chaining.build_chains(llm)
+    transform_chain = prompt_chaining.prompt_transform | llm | StrOutputParser()
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    writer_cls = ParquetWriter if output_format == "parquet" else JsonlWriter
+    writer = writer_cls(output_path, checkpoint)
+
+    in_flight = asyncio.Semaphore(max_in_flight)
+    to_extract: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight * 2)
+    to_transform: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight * 2)
+    finished: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight * 2)
+    start_offset = checkpoint["offset"]
+    failed = set(checkpoint.get("failed", []))
+    retry = set(failed) if retry_failed else set()
+    stats = {"records": 0, "errors": 0, "retried": 0, "resumed_from": start_offset}
+
+    async def reader():
+        if retry:
+            # Records that failed in an earlier run (all of them lie before the checkpoint offset)
+            for index, record in read_jsonl(input_path):
+                if index >= start_offset:
+                    break
+                if index in retry and record is not None:
+                    await to_extract.put((index, record))
+        for index, record in read_jsonl(input_path, skip=start_offset):
+            if record is None:
+                # Blank line: nothing to run, but the writer must still step over it
+                await finished.put((index, None, None, None))
+            else:
+                await to_extract.put((index, record))
+        for _ in range(max_in_flight):
+            await to_extract.put(_DONE)
+
+    async def extract_worker():
+        while (item := await to_extract.get()) is not _DONE:
+            index, record = item
+            try:
+                async with in_flight:
+                    specs = await extraction_chain.ainvoke({"text_input": record[text_field]})
+                await to_transform.put((index, record, specs))
+            except Exception as e:
+                await finished.put((index, record, None, repr(e)))
+
+    async def transform_worker():
+        while (item := await to_transform.get()) is not _DONE:
+            index, record, specs = item
+            try:
+                async with in_flight:
+                    output = await transform_chain.ainvoke({"specifications": specs})
+                await finished.put((index, record, output, None))
+            except Exception as e:
+                await finished.put((index, record, None, repr(e)))
+
+    async def stage(workers, next_queue):
+        await asyncio.gather(*workers)
+        for _ in range(max_in_flight if next_queue is not finished else 1):
+            await next_queue.put(_DONE)
+
+    async def write_in_order():
+        pending = {}
+        next_index = start_offset
+        since_flush = 0
+
+        def flush():
+            checkpoint["offset"] = next_index
+            checkpoint["failed"] = sorted(failed)
+            writer.flush(checkpoint)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+        while (item := await finished.get()) is not _DONE:
+            index, record, output, error = item
+            if index < start_offset:
+                # A retried record: its error row is already in the output, so only a success is written
+                if error is None:
+                    writer.write({"index": index, "input": record, "output": output, "error": None})
+                    failed.discard(index)
+                    stats["retried"] += 1
+                    since_flush += 1
+                continue
+            pending[index] = item
+            while next_index in pending:
+                index, record, output, error = pending.pop(next_index)
+                next_index += 1
+                if record is None:
+                    continue
+                writer.write({"index": index, "input": record, "output": output, "error": error})
+                stats["records"] += 1
+                if error is not None:
+                    stats["errors"] += 1
+                    failed.add(index)
+                since_flush += 1
+            if since_flush >= flush_every:
+                flush()
+                since_flush = 0
+        flush()
+        stats["still_failed"] = len(failed)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            reader(),
+            stage([extract_worker() for _ in range(max_in_flight)], to_transform),
+            stage([transform_worker() for _ in range(max_in_flight)], finished),
+            write_in_order(),
+        )
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = elapsed
+    stats["records_per_s"] = stats["records"] / elapsed if elapsed else 0.0
+    return stats
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    import tempfile
+
+    from fake_llm import LocalFakeChatModel
+
+    workdir = tempfile.mkdtemp()
+    input_path = os.path.join(workdir, "products.jsonl")
+    with open(input_path, "w") as f:
+        for i in range(2_000):
+            f.write(json.dumps({"text_input": f"Laptop #{i}: 3.5 GHz CPU, 16GB RAM, 1TB SSD."}) + "\n")
+
+    # 50 ms per model call: sequentially this would take 2000 * 2 * 0.05 = 200s
+    llm = LocalFakeChatModel(latency=0.05)
+    stats = asyncio.run(run_batch(
+        input_path,
+        os.path.join(workdir, "results.jsonl"),
+        llm,
+        max_in_flight=100,
+        checkpoint_path=os.path.join(workdir, "checkpoint.json"),
+    ))
+    print(stats)
@@ -0,0 +1,198 @@
+import hashlib
+import importlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+
+# The chain definitions live in 1_prompt_chaining.py (not a valid identifier for `import`)
+prompt_chaining = importlib.import_module("1_prompt_chaining")
+
+
+# --- Persistent Response Cache ---
+# LangChain chat models accept a `cache=` object and call lookup()/update() with
+# the rendered messages (`prompt`) and the model name + parameters (`llm_string`).
+# The key is a SHA-256 of both, so identical requests to an identically
+# configured model (e.g. temperature=0) are answered from disk.
+
+class SQLiteResponseCache(BaseCache):
+    def __init__(
+        self,
+        path: str = ".llm_cache.sqlite",
+        max_entries: int = 100_000,
+        ttl_seconds: Optional[float] = None,
+        access_flush_size: int = 1_000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.access_flush_size = access_flush_size
+        # Last-access times of cache hits, written in batches: one commit per hit
+        # would make a fully cached re-run cost one fsync per record
+        self._pending_access: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only syncs at checkpoints; a crash can lose the last
+        # few writes, which for a cache just means a few extra model calls
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._pending_access[key] = now
+            if len(self._pending_access) >= self.access_flush_size:
+                self._flush_access()
+                self._conn.commit()
+            self.hits += 1
+        messages = messages_from_dict(json.loads(row[0]))
+        return [ChatGeneration(message=message) for message in messages]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps([message_to_dict(g.message) for g in return_val]), now, now),
+            )
+            self._pending_access.pop(key, None)
+            if not exists:
+                self._size += 1
+            if self._size > self.max_entries:
+                self._evict_least_recently_used()
+            self._conn.commit()
+
+    def _flush_access(self) -> None:
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(at, key) for key, at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def flush(self) -> None:
+        """Writes buffered last-access times (also done on eviction and close())."""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def _evict_least_recently_used(self) -> None:
+        # Recency must be up to date before picking what to evict
+        self._flush_access()
+        excess = self._size - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (excess,),
+            )
+            self._size -= excess
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._pending_access.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def with_cache(llm: BaseChatModel, cache: Optional[BaseCache]) -> BaseChatModel:
+    """Returns a copy of `llm` that reads/writes `cache` (cache=False disables any global cache)."""
+    return llm.model_copy(update={"cache": cache if cache is not None else False})
+
+
+def build_cached_chains(
+    llm: BaseChatModel,
+    cache: BaseCache,
+    cache_stages: Sequence[str] = ("extract", "transform"),
+):
+    """
+    Same chains as 1_prompt_chaining.build_chains(), with caching switched on
+    per stage. Caching "extract" also skips the extraction call when only the
+    transformation prompt changes.
+    """
+    extract_llm = with_cache(llm, cache if "extract" in cache_stages else None)
+    transform_llm = with_cache(llm, cache if "transform" in cache_stages else None)
+    return prompt_chaining.build_chains(extract_llm, transform_llm)
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from fake_llm import LocalFakeChatModel
+
+    llm = LocalFakeChatModel(model="gemini-2.0-flash-lite", temperature=0)
+    cache_path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite")
+    cache = SQLiteResponseCache(cache_path, max_entries=10_000, ttl_seconds=24 * 3600)
+    _, full_chain = build_cached_chains(llm, cache)
+
+    descriptions = [
+        {"text_input": f"Laptop #{i % 50}: 3.5 GHz octa-core CPU, 16GB RAM, 1TB NVMe SSD."}
+        for i in range(500)
+    ]
+
+    for run in (1, 2):
+        # Every cache miss is exactly one model call
+        before = cache.misses
+        start = time.perf_counter()
+        full_chain.batch(descriptions)
+        print(
+            f"Run {run}: {cache.misses - before} model calls "
+            f"in {time.perf_counter() - start:.2f}s, cache {cache.stats()}"
+        )
+    cache.close()
@@ -1,22 +1,28 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import time
+from collections import defaultdict
+from functools import cache, partial
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough, RunnableBranch, RunnableLambda
-from dotenv import load_dotenv
+from langchain_core.runnables import Runnable, RunnablePassthrough, RunnableLambda
+from langchain_core.runnables.config import patch_config
+
+import lazy
 
-load_dotenv()
 # --- Configuration ---
-# Ensure your GOOGLE_API_KEY environment variable is set
+# Ensure your GOOGLE_API_KEY environment variable is set.
+# The model is only created on first use of get_llm() (or `llm`, see bottom).
 
-try:
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0
-    )
-    print(f"Language model initialized: {llm.model}")
-except Exception as e:
-    print(f"Error initializing language model: {e}")
-    llm = None
+@cache
+def get_llm():
+    try:
+        llm = lazy.gemini("gemini-2.5-flash", temperature=0)
+        print(f"Language model initialized: {llm.model}")
+        return llm
+    except Exception as e:
+        print(f"Error initializing language model: {e}")
+        return None
 
 # --- Simulated Sub-Agent Handlers ---
 def booking_handler(request: str) -> str:
@@ -56,10 +62,11 @@ ONLY output one word: 'booker', 'info', or 'unclear'."""
     ("user", "{request}")
 ])
 
-# Initialize coordinator_router_chain (will be None if llm fails to initialize)
-coordinator_router_chain = None
-if llm:
-    coordinator_router_chain = coordinator_router_prompt | llm | StrOutputParser()
+# coordinator_router_chain is None if the llm fails to initialize
+@cache
+def get_coordinator_router_chain():
+    llm = get_llm()
+    return coordinator_router_prompt | llm | StrOutputParser() if llm else None
 
 # --- Delegation Logic ---
 branches = {
@@ -74,25 +81,136 @@ branches = {
     ),
 }
 
-delegation_branch = RunnableBranch(
-    (lambda x: x["decision"].strip() == "booker", branches["booker"]),  # type: ignore[arg-type]
-    (lambda x: x["decision"].strip() == "info", branches["info"]),  # type: ignore[arg-type]
-    branches["unclear"], # type: ignore[arg-type]
-)
+def normalize_decision(decision: str) -> str:
+    return decision.strip().strip("'\".").lower()
+
+class DispatchRouter(Runnable):
+    """
+    O(1) dict dispatch from the normalized x["decision"] to a handler runnable.
+    batch()/abatch() group inputs by handler and run each group through the
+    handler's own batch()/abatch(), then restore the original order. Per-input
+    configs (callbacks, tags) follow their inputs into the handler groups.
+    """
+
+    def __init__(self, handlers: dict, default: str = "unclear"):
+        self.handlers = handlers
+        self.default = default
+        self.timings = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+
+    def _route(self, x) -> str:
+        key = normalize_decision(x["decision"])
+        return key if key in self.handlers else self.default
+
+    def _record(self, key: str, calls: int, start: float) -> None:
+        self.timings[key]["calls"] += calls
+        self.timings[key]["seconds"] += time.perf_counter() - start
+
+    def _group(self, inputs: list) -> dict:
+        groups = defaultdict(list)
+        for i, x in enumerate(inputs):
+            groups[self._route(x)].append(i)
+        return groups
+
+    def _invoke(self, input, run_manager, config, **kwargs):
+        key = self._route(input)
+        start = time.perf_counter()
+        output = self.handlers[key].invoke(input, patch_config(config, callbacks=run_manager.get_child()), **kwargs)
+        self._record(key, 1, start)
+        return output
+
+    async def _ainvoke(self, input, run_manager, config, **kwargs):
+        key = self._route(input)
+        start = time.perf_counter()
+        output = await self.handlers[key].ainvoke(
+            input, patch_config(config, callbacks=run_manager.get_child()), **kwargs
+        )
+        self._record(key, 1, start)
+        return output
+
+    def invoke(self, input, config=None, **kwargs):
+        # Run through _call_with_config so the router itself shows up in callbacks / traces
+        return self._call_with_config(self._invoke, input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self._acall_with_config(self._ainvoke, input, config, **kwargs)
+
+    def _batch(self, inputs, config, **kwargs):
+        # `config` holds one (child) config per input; it is split along with the inputs
+        outputs = [None] * len(inputs)
+        for key, indices in self._group(inputs).items():
+            start = time.perf_counter()
+            results = self.handlers[key].batch(
+                [inputs[i] for i in indices], [config[i] for i in indices], **kwargs
+            )
+            self._record(key, len(indices), start)
+            for i, result in zip(indices, results):
+                outputs[i] = result
+        return outputs
+
+    async def _abatch(self, inputs, config, **kwargs):
+        outputs = [None] * len(inputs)
+
+        async def run_group(key, indices):
+            start = time.perf_counter()
+            results = await self.handlers[key].abatch(
+                [inputs[i] for i in indices], [config[i] for i in indices], **kwargs
+            )
+            self._record(key, len(indices), start)
+            for i, result in zip(indices, results):
+                outputs[i] = result
+
+        await asyncio.gather(*(run_group(k, idx) for k, idx in self._group(inputs).items()))
+        return outputs
+
+    def batch(self, inputs, config=None, *, return_exceptions=False, **kwargs):
+        return self._batch_with_config(
+            partial(self._batch, return_exceptions=return_exceptions), inputs, config,
+            return_exceptions=return_exceptions, **kwargs,
+        )
+
+    async def abatch(self, inputs, config=None, *, return_exceptions=False, **kwargs):
+        return await self._abatch_with_config(
+            partial(self._abatch, return_exceptions=return_exceptions), inputs, config,
+            return_exceptions=return_exceptions, **kwargs,
+        )
+
+    def stats(self) -> dict:
+        return {
+            key: {**t, "mean_ms": t["seconds"] / t["calls"] * 1000 if t["calls"] else 0.0}
+            for key, t in self.timings.items()
+        }
+
+delegation_branch = DispatchRouter(branches, default="unclear")
 
 # --- Coordinator Agent ---
-coordinator_agent = (
-    {
-        "decision": coordinator_router_chain,
-        "request": RunnablePassthrough(),
-    }
-    | delegation_branch  # type: ignore[arg-type]
-    | RunnableLambda(lambda x: x["output"])
-)
+def build_coordinator_agent(router):
+    """Wires any runnable that maps {"request": ...} to a decision string into the delegation branch."""
+    return (
+        {
+            "decision": router,
+            "request": RunnablePassthrough(),
+        }
+        | delegation_branch  # type: ignore[arg-type]
+        | RunnableLambda(lambda x: x["output"])
+    )
+
+@cache
+def get_coordinator_agent():
+    router_chain = get_coordinator_router_chain()
+    return build_coordinator_agent(router_chain) if router_chain else None
+
+# `llm`, `coordinator_router_chain` and `coordinator_agent` stay available as
+# module attributes, but are only built on first access
+__getattr__ = lazy.lazy_attributes(globals(), {
+    "llm": get_llm,
+    "coordinator_router_chain": get_coordinator_router_chain,
+    "coordinator_agent": get_coordinator_agent,
+})
 
 # --- Example Usage ---
 def main():
-    if not llm:
+    coordinator_agent = get_coordinator_agent()
+    if not coordinator_agent:
         print("\nSkipping execution due to LLM initialization failure.")
         return
 
@@ -111,5 +229,11 @@ def main():
     result_c = coordinator_agent.invoke({"request": request_c})
     print(f"Final Result C: {result_c}")
 
+    print("\n--- Running a batch (grouped by handler) ---")
+    results = coordinator_agent.batch([{"request": r} for r in (request_a, request_b, request_c)])
+    for result in results:
+        print(f"Batch Result: {result}")
+    print(f"Per-handler timings: {delegation_branch.stats()}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,220 @@
+import importlib
+import math
+import re
+import time
+from collections import Counter, defaultdict, deque
+from typing import Optional
+
+from langchain_core.runnables import Runnable, RunnableLambda
+
+# Handlers, prompt and delegation logic live in 2_routing.py
+routing = importlib.import_module("2_routing")
+
+ROUTES = ("booker", "info", "unclear")
+
+
+# --- Tier 1: Keyword / Regex Matcher ---
+# One compiled alternation with a named group per route. Only an unambiguous
+# match (exactly one route fires) is trusted.
+
+DEFAULT_PATTERNS = {
+    "booker": r"\b(?:book|booking|reserve|reservation|flights?|hotels?|tickets?)\b",
+    "info": r"^(?:what|who|when|where|which|how)\b|\b(?:capital|population|weather)\b",
+}
+
+
+class KeywordRouter:
+    def __init__(self, patterns: dict[str, str] = DEFAULT_PATTERNS):
+        self._regex = re.compile(
+            "|".join(f"(?P<{route}>{pattern})" for route, pattern in patterns.items()),
+            re.IGNORECASE,
+        )
+
+    def route(self, request: str) -> Optional[str]:
+        matched = {m.lastgroup for m in self._regex.finditer(request)}
+        return matched.pop() if len(matched) == 1 else None
+
+
+# --- Tier 2: Local TF-IDF Nearest-Centroid Classifier ---
+# Trained from logged (request, decision) pairs, usually the LLM's own past answers.
+# Confidence is the cosine margin between the best and the second best route.
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class CentroidClassifier:
+    def __init__(self):
+        self.idf: dict[str, float] = {}
+        self.centroids: dict[str, dict[str, float]] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return bool(self.centroids)
+
+    def _vector(self, text: str) -> dict[str, float]:
+        counts = Counter(t for t in _tokenize(text) if t in self.idf)
+        vec = {t: c * self.idf[t] for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {t: v / norm for t, v in vec.items()}
+
+    def fit(self, requests: list[str], decisions: list[str]) -> "CentroidClassifier":
+        doc_freq = Counter(t for r in requests for t in set(_tokenize(r)))
+        n = len(requests)
+        self.idf = {t: math.log((1 + n) / (1 + df)) + 1 for t, df in doc_freq.items()}
+
+        sums: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for request, decision in zip(requests, decisions):
+            for t, v in self._vector(request).items():
+                sums[decision][t] += v
+        self.centroids = {}
+        for decision, vec in sums.items():
+            norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+            self.centroids[decision] = {t: v / norm for t, v in vec.items()}
+        return self
+
+    def predict(self, request: str) -> tuple[Optional[str], float]:
+        """Returns (decision, confidence in [0, 1])."""
+        if not self.centroids:
+            return None, 0.0
+        vec = self._vector(request)
+        scores = sorted(
+            ((sum(v * centroid.get(t, 0.0) for t, v in vec.items()), decision)
+             for decision, centroid in self.centroids.items()),
+            reverse=True,
+        )
+        best_score, best = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+        return best, best_score - runner_up
+
+
+# --- Tiered Router ---
+
+class TieredRouter:
+    """
+    keyword regex → local classifier → LLM (coordinator_router_chain).
+    The LLM is only called when the cheaper tiers are not confident enough;
+    its answers are logged so the classifier can be retrained from them.
+    """
+
+    def __init__(
+        self,
+        llm_router: Optional[Runnable] = None,
+        keyword_router: Optional[KeywordRouter] = None,
+        classifier: Optional[CentroidClassifier] = None,
+        confidence_threshold: float = 0.2,
+        retrain_every: int = 100,
+        latency_window: int = 10_000,
+    ):
+        self.llm_router = llm_router
+        self.keyword_router = keyword_router or KeywordRouter()
+        self.classifier = classifier or CentroidClassifier()
+        self.confidence_threshold = confidence_threshold
+        self.retrain_every = retrain_every
+        self.decision_log: list[tuple[str, str]] = []
+        self._hits: Counter = Counter()
+        # Percentiles cover the most recent `latency_window` routings only
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    @staticmethod
+    def _normalize(decision: str) -> str:
+        decision = routing.normalize_decision(decision)
+        return decision if decision in ROUTES else "unclear"
+
+    def log_decision(self, request: str, decision: str) -> None:
+        self.decision_log.append((request, decision))
+        if self.retrain_every and len(self.decision_log) % self.retrain_every == 0:
+            self.retrain()
+
+    def retrain(self) -> None:
+        requests, decisions = zip(*self.decision_log)
+        self.classifier.fit(list(requests), list(decisions))
+
+    def _route(self, request: str) -> tuple[str, str]:
+        decision = self.keyword_router.route(request)
+        if decision:
+            return decision, "keyword"
+
+        decision, confidence = self.classifier.predict(request)
+        if decision and (confidence >= self.confidence_threshold or self.llm_router is None):
+            return decision, "classifier"
+
+        if self.llm_router is None:
+            return "unclear", "default"
+        decision = self._normalize(self.llm_router.invoke({"request": request}))
+        self.log_decision(request, decision)
+        return decision, "llm"
+
+    def route(self, request: str) -> str:
+        start = time.perf_counter()
+        decision, tier = self._route(request)
+        self._latencies.append(time.perf_counter() - start)
+        self._hits[tier] += 1
+        return decision
+
+    def as_runnable(self) -> Runnable:
+        """Drop-in replacement for coordinator_router_chain (takes {"request": ...})."""
+        return RunnableLambda(lambda x: self.route(x["request"]))
+
+    def stats(self) -> dict:
+        total = sum(self._hits.values())
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+        return {
+            "requests": total,
+            "tier_hit_rate": {tier: count / total for tier, count in self._hits.items()} if total else {},
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+        }
+
+
+# --- Example Usage ---
+if __name__ == "__main__":
+    import argparse
+
+    from fake_llm import LocalFakeChatModel
+
+    parser = argparse.ArgumentParser(description="Tiered router demo (offline unless --live)")
+    parser.add_argument("--live", action="store_true",
+                        help="use the Gemini coordinator_router_chain for the LLM tier (paid API calls)")
+    args = parser.parse_args()
+
+    def fake_router_llm(messages):
+        text = messages[-1].content.lower()
+        if any(w in text for w in ("book", "flight", "hotel", "trip", "room")):
+            return "booker"
+        return "info" if text.endswith("?") else "unclear"
+
+    # Offline stand-in for Gemini, slow enough to make the LLM tier visible
+    llm_router = routing.coordinator_router_prompt | LocalFakeChatModel(
+        respond=fake_router_llm, latency=0.3
+    ) | routing.StrOutputParser()
+    if args.live:
+        if routing.coordinator_router_chain is None:
+            parser.exit(1, "Gemini router could not be initialized\n")
+        llm_router = routing.coordinator_router_chain
+
+    router = TieredRouter(llm_router=llm_router, retrain_every=4)
+    coordinator = routing.build_coordinator_agent(router.as_runnable())
+
+    requests = [
+        "Book me a flight to London.",
+        "What is the capital of Italy?",
+        "Plan a trip and get me a room in Rome",
+        "Tell me about quantum physics.",
+        "Could you explain photosynthesis?",
+        "Get me a room near the station",
+        "Explain black holes to me?",
+        "Plan a trip to Tokyo",
+    ] * 3
+    for request in requests:
+        coordinator.invoke({"request": request})
+
+    print("\n--- Routing stats ---")
+    print(router.stats())
@@ -1,36 +1,62 @@
 import datetime
 import getpass
+import importlib
+import operator
 import os
+from functools import cache
 from typing import Annotated
 from typing_extensions import TypedDict
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain_community.utilities.tavily_search import TavilySearchAPIWrapper
-from langchain_core.messages import HumanMessage, ToolMessage, AIMessage
+from langchain_core.messages import HumanMessage, ToolMessage
 from langchain_core.output_parsers.openai_tools import PydanticToolsParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.tools import StructuredTool
-from langgraph.graph import END, StateGraph, START
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode
 from pydantic import BaseModel, Field
-from dotenv import load_dotenv
 
-load_dotenv()
+import lazy
+
+# LLM, Tavily and the LangGraph graph are built on first use (get_graph() or
+# the `graph` module attribute), so importing this module never prompts for keys.
+
 # --- Setup Environment ---
 def _set_if_undefined(var: str) -> None:
     if not os.environ.get(var):
         os.environ[var] = getpass.getpass(f"Please enter {var}: ")
 
-_set_if_undefined("GOOGLE_API_KEY")
-_set_if_undefined("TAVILY_API_KEY")
+@cache
+def setup_environment() -> None:
+    lazy.load_env()
+    _set_if_undefined("GOOGLE_API_KEY")
+    _set_if_undefined("TAVILY_API_KEY")
 
 # --- Define LLM and Tools ---
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0)
+@cache
+def get_llm():
+    setup_environment()
+    return lazy.gemini("gemini-2.5-pro", temperature=0)
+
+# Concurrent, deduplicated and cached search fan-out (see 3_reflexion_search.py)
+reflexion_search = importlib.import_module("3_reflexion_search")
+
+@cache
+def get_search_executor():
+    setup_environment()
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    from langchain_community.utilities.tavily_search import TavilySearchAPIWrapper
+
+    search = TavilySearchAPIWrapper()
+    tavily_tool = TavilySearchResults(api_wrapper=search, max_results=5)
+    return reflexion_search.SearchExecutor(
+        reflexion_search.TavilyBackend(tavily_tool),
+        reflexion_search.SearchCache(ttl_seconds=3600),
+        max_concurrency=5,
+        rate_limits={"tavily": 5},
+    )
 
-search = TavilySearchAPIWrapper()
-tavily_tool = TavilySearchResults(api_wrapper=search, max_results=5)
+# Token-budget-aware history compaction and payload measurement (see 3_reflexion_compaction.py)
+reflexion_compaction = importlib.import_module("3_reflexion_compaction")
+TOKEN_BUDGET = 6_000
+payload_meter = reflexion_compaction.PayloadMeter()
 
 # --- Define Schemas ---
 class Reflection(BaseModel):
@@ -53,26 +79,31 @@ class ReviseAnswer(AnswerQuestion):
 
 # --- Actor Logic with Retries ---
 class ResponderWithRetries:
-    def __init__(self, runnable, validator):
+    def __init__(self, runnable, validator, name, token_budget=TOKEN_BUDGET):
         self.runnable = runnable
         self.validator = validator
+        self.name = name
+        self.token_budget = token_budget
 
     def respond(self, state: dict):
-        messages = state["messages"]
+        # Stale tool outputs are stubbed or dropped before sending; state keeps the full history
+        messages = reflexion_compaction.compact_messages(state["messages"], self.token_budget)
         for attempt in range(3):
+            payload_meter.record(self.name, messages, original=state["messages"])
             response = self.runnable.invoke({"messages": messages})
             try:
                 # Gemini tool calling validation
                 self.validator.invoke(response)
-                return {"messages": [response]}
+                return {"messages": [response], "iterations": 1}
             except Exception as e:
                 # Add error feedback to the message history for the next retry
                 feedback = ToolMessage(
                     content=f"Validation Error: {repr(e)}. Please fix the tool call arguments.",
                     tool_call_id=response.tool_calls[0]["id"] if response.tool_calls else "none"
                 )
-                messages = messages + [response, feedback]
-        return {"messages": [response]}
+                # `messages` is already our own copy, so extend it in place
+                messages.extend((response, feedback))
+        return {"messages": [response], "iterations": 1}
 
 # --- Prompts and Chains ---
 actor_prompt_template = ChatPromptTemplate.from_messages([
@@ -85,61 +116,92 @@ actor_prompt_template = ChatPromptTemplate.from_messages([
              "Respond using the {function_name} function.</system>"),
 ]).partial(time=lambda: datetime.datetime.now().isoformat())
 
-initial_answer_chain = actor_prompt_template.partial(
-    first_instruction="Provide a detailed ~250 word answer.",
-    function_name=AnswerQuestion.__name__,
-) | llm.bind_tools(tools=[AnswerQuestion])
-
 revision_instructions = """Revise your previous answer using the new information.
 - Use previous critique to add important info.
 - MUST include numerical citations [1], [2], etc.
 - Add a 'References' section at the bottom.
 - Ensure the answer (excluding references) is under 250 words."""
 
-revision_chain = actor_prompt_template.partial(
-    first_instruction=revision_instructions,
-    function_name=ReviseAnswer.__name__,
-) | llm.bind_tools(tools=[ReviseAnswer])
+def build_chains(llm):
+    """Returns (initial_answer_chain, revision_chain)."""
+    initial_answer_chain = actor_prompt_template.partial(
+        first_instruction="Provide a detailed ~250 word answer.",
+        function_name=AnswerQuestion.__name__,
+    ) | llm.bind_tools(tools=[AnswerQuestion])
 
-# --- Nodes ---
-first_responder = ResponderWithRetries(runnable=initial_answer_chain, validator=PydanticToolsParser(tools=[AnswerQuestion]))
-revisor = ResponderWithRetries(runnable=revision_chain, validator=PydanticToolsParser(tools=[ReviseAnswer]))
+    revision_chain = actor_prompt_template.partial(
+        first_instruction=revision_instructions,
+        function_name=ReviseAnswer.__name__,
+    ) | llm.bind_tools(tools=[ReviseAnswer])
+    return initial_answer_chain, revision_chain
 
+# --- Nodes ---
 def run_queries(search_queries: list[str], **kwargs):
     """Execute search queries using Tavily search tool."""
-    return tavily_tool.batch([{"query": query} for query in search_queries])
+    return get_search_executor().run_sync(search_queries)
 
-tool_node = ToolNode([
-    StructuredTool.from_function(run_queries, name=AnswerQuestion.__name__),
-    StructuredTool.from_function(run_queries, name=ReviseAnswer.__name__),
-])
+async def arun_queries(search_queries: list[str], **kwargs):
+    """Execute search queries using Tavily search tool."""
+    return await get_search_executor().run(search_queries)
 
 # --- Graph Construction ---
-class State(TypedDict):
-    messages: Annotated[list, add_messages]
+MAX_ITERATIONS = 3
+
+def event_loop(state: dict):
+    from langgraph.graph import END
 
-def event_loop(state: State):
     # Logic to stop after specific number of AI/Tool loops
-    count = sum(1 for m in state["messages"] if isinstance(m, AIMessage) and m.tool_calls)
-    if count > 3: # MAX_ITERATIONS
+    if state.get("iterations", 0) > MAX_ITERATIONS:
         return END
     return "execute_tools"
 
-builder = StateGraph(State)
-builder.add_node("draft", first_responder.respond)
-builder.add_node("execute_tools", tool_node)
-builder.add_node("revise", revisor.respond)
+def build_graph(llm):
+    from langgraph.graph import END, StateGraph, START
+    from langgraph.graph.message import add_messages
+    from langgraph.prebuilt import ToolNode
 
-builder.add_edge(START, "draft")
-builder.add_edge("draft", "execute_tools")
-builder.add_edge("execute_tools", "revise")
-builder.add_conditional_edges("revise", event_loop, ["execute_tools", END])
+    class State(TypedDict):
+        messages: Annotated[list, add_messages]
+        # Running count of draft/revise responses, so the loop check is O(1)
+        iterations: Annotated[int, operator.add]
 
-graph = builder.compile()
+    initial_answer_chain, revision_chain = build_chains(llm)
+    first_responder = ResponderWithRetries(runnable=initial_answer_chain, validator=PydanticToolsParser(tools=[AnswerQuestion]), name="draft")
+    revisor = ResponderWithRetries(runnable=revision_chain, validator=PydanticToolsParser(tools=[ReviseAnswer]), name="revise")
+
+    tool_node = ToolNode([
+        StructuredTool.from_function(run_queries, coroutine=arun_queries, name=AnswerQuestion.__name__),
+        StructuredTool.from_function(run_queries, coroutine=arun_queries, name=ReviseAnswer.__name__),
+    ])
+
+    builder = StateGraph(State)
+    builder.add_node("draft", first_responder.respond)
+    builder.add_node("execute_tools", tool_node)
+    builder.add_node("revise", revisor.respond)
+
+    builder.add_edge(START, "draft")
+    builder.add_edge("draft", "execute_tools")
+    builder.add_edge("execute_tools", "revise")
+    builder.add_conditional_edges("revise", event_loop, ["execute_tools", END])
+
+    return builder.compile()
+
+@cache
+def get_graph():
+    return build_graph(get_llm())
+
+__getattr__ = lazy.lazy_attributes(globals(), {
+    "llm": get_llm,
+    "search_executor": get_search_executor,
+    "graph": get_graph,
+})
 
 # --- Execution ---
 if __name__ == "__main__":
-    inputs = {"messages": [HumanMessage(content="How should we handle the climate crisis?")]}
-    for event in graph.stream(inputs, stream_mode="values"):
+    inputs = {"messages": [HumanMessage(content="How should we handle the climate crisis?")], "iterations": 0}
+    for event in get_graph().stream(inputs, stream_mode="values"):
         if "messages" in event:
-            event["messages"][-1].pretty_print()
\ No newline at end of file
+            event["messages"][-1].pretty_print()
+
+    print("\n--- Payload sent per node ---")
+    print(payload_meter.report())
\ No newline at end of file
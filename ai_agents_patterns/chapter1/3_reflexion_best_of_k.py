@@ -0,0 +1,227 @@
+import asyncio
+import importlib
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+
+# Task, prompts and the diff-based context builders live in 3_reflexion_speculative.py
+speculative = importlib.import_module("3_reflexion_speculative")
+
+# The task's tests, one case per entry, so candidates can be ranked by how many they pass
+TASK_TEST_CASES = [
+    "assert calculate_factorial(0) == 1",
+    "assert calculate_factorial(1) == 1",
+    "assert calculate_factorial(5) == 120",
+    "assert calculate_factorial(10) == 3628800",
+    (
+        "try:\n"
+        "    calculate_factorial(-1)\n"
+        "except ValueError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('negative input must raise ValueError')"
+    ),
+]
+
+
+# --- Candidate Scoring (runs inside pool workers) ---
+
+class _Timeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def score_candidate(code: str, test_cases: list[str], timeout: float) -> tuple[int, str]:
+    """
+    Executes `code` and then every test case in a fresh namespace.
+    Returns (number of passing cases, first failure). Each exec is bounded by
+    SIGALRM, so an infinite loop in a candidate only costs `timeout` seconds.
+    """
+    signal.signal(signal.SIGALRM, _on_alarm)
+    namespace: dict = {}
+
+    def run(source: str) -> Optional[str]:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            exec(compile(source, "<candidate>", "exec"), namespace)
+            return None
+        except _Timeout:
+            return f"timed out after {timeout}s"
+        except BaseException as e:
+            return f"{type(e).__name__}: {e}"
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    error = run(code)
+    if error:
+        return 0, f"code: {error}"
+
+    passed, first_failure = 0, ""
+    for case in test_cases:
+        error = run(case)
+        if error is None:
+            passed += 1
+        elif not first_failure:
+            first_failure = f"{case.splitlines()[0]} -> {error}"
+    return passed, first_failure
+
+
+# --- Pool Handling ---
+
+def _terminate_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Shuts the pool down without waiting for its workers: a worker stuck in C
+    code (where SIGALRM cannot interrupt it) would block shutdown(wait=True).
+    """
+    terminate_workers = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Runner ---
+
+@dataclass
+class BestOfKReport:
+    code: str
+    score: int
+    rounds: int
+    model_calls: int
+    seconds: float
+    log: list = field(default_factory=list)
+
+
+async def run_best_of_k(
+    llm: BaseChatModel,
+    k: int = 4,
+    test_cases: list[str] = TASK_TEST_CASES,
+    max_rounds: int = 3,
+    timeout: float = 5.0,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> BestOfKReport:
+    """
+    Each round generates `k` candidates with one `abatch` call, scores them
+    in parallel in a process pool and keeps only the best one. The loop stops
+    as soon as a candidate passes every test; otherwise the best candidate is
+    critiqued and the next round refines from it. A round whose workers hang or
+    die scores those candidates 0 and the pool is replaced before the next round.
+    """
+    start = time.perf_counter()
+    owns_pool = pool is None
+    pool = pool or ProcessPoolExecutor(max_workers=k)
+    loop = asyncio.get_running_loop()
+    calls = 0
+    log = []
+
+    async def score_all(codes: list[str]) -> list[tuple[int, str]]:
+        nonlocal pool, owns_pool
+        futures = [
+            loop.run_in_executor(pool, score_candidate, code, test_cases, timeout)
+            for code in codes
+        ]
+        # Backstop for candidates that escape SIGALRM (e.g. stuck in C code), shared by the whole round
+        done, _ = await asyncio.wait(futures, timeout=timeout * (len(test_cases) + 2))
+        results, pool_lost = [], False
+        for future in futures:
+            if future not in done:
+                future.cancel()
+                results.append((0, "worker failed: timed out"))
+                pool_lost = True
+            elif isinstance(future.exception(), BrokenProcessPool):
+                results.append((0, "worker failed: BrokenProcessPool"))
+                pool_lost = True
+            else:
+                results.append(future.result())
+
+        if pool_lost:
+            # The stuck or dead worker is gone for good: start the next round on a fresh pool.
+            # A caller's pool is left alone (theirs to clean up) and replaced by one we own.
+            if owns_pool:
+                _terminate_pool(pool)
+            pool, owns_pool = ProcessPoolExecutor(max_workers=k), True
+        return results
+
+    messages = [HumanMessage(content=speculative.TASK_PROMPT)]
+    best_code, best_score, previous = "", -1, ""
+    try:
+        for round_number in range(1, max_rounds + 1):
+            responses = await llm.abatch([messages] * k)
+            calls += k
+            codes = [speculative.extract_code(r.content) for r in responses]
+            scores = await score_all(codes)
+
+            best = max(range(len(codes)), key=lambda i: scores[i][0])
+            best_code, (best_score, failure) = codes[best], scores[best]
+            log.append(f"round {round_number}: scores {[s for s, _ in scores]}, kept {best_score}/{len(test_cases)}")
+            if best_score == len(test_cases) or round_number == max_rounds:
+                break
+
+            critique = (await llm.ainvoke(speculative.critique_messages(best_code))).content
+            calls += 1
+            feedback = f"Critique:\n{critique}\n\nFirst failing test:\n{failure}"
+            messages = speculative.refine_messages(best_code, previous, feedback)
+            previous = best_code
+    finally:
+        if owns_pool:
+            _terminate_pool(pool)
+
+    return BestOfKReport(
+        code=best_code,
+        score=best_score,
+        rounds=len(log),
+        model_calls=calls,
+        seconds=time.perf_counter() - start,
+        log=log,
+    )
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    from itertools import count
+
+    from fake_llm import LocalFakeChatModel
+
+    CANDIDATES = [
+        # off by one
+        "def calculate_factorial(n):\n    r = 1\n    for i in range(1, n):\n        r *= i\n    return r\n",
+        # never terminates for n > 0
+        "def calculate_factorial(n):\n    r = 1\n    while n:\n        r *= n\n    return r\n",
+        # correct but accepts negatives
+        "def calculate_factorial(n):\n    r = 1\n    for i in range(2, n + 1):\n        r *= i\n    return r\n",
+        # correct
+        (
+            "def calculate_factorial(n):\n"
+            '    """Returns n! for n >= 0."""\n'
+            "    if n < 0:\n"
+            "        raise ValueError('n must be non-negative')\n"
+            "    r = 1\n"
+            "    for i in range(2, n + 1):\n"
+            "        r *= i\n"
+            "    return r\n"
+        ),
+    ]
+    turn = count()
+
+    def canned_candidates(messages):
+        return f"```python\n{CANDIDATES[next(turn) % len(CANDIDATES)]}```"
+
+    async def main():
+        llm = LocalFakeChatModel(respond=canned_candidates, latency=0.5, temperature=0.8)
+        report = await run_best_of_k(llm, k=4, timeout=0.5)
+        print("\n".join(report.log))
+        print(f"\nBest candidate ({report.score}/{len(TASK_TEST_CASES)} tests, "
+              f"{report.model_calls} model calls, {report.seconds:.2f}s):\n{report.code}")
+
+    asyncio.run(main())
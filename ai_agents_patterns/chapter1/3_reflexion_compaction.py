@@ -0,0 +1,118 @@
+import json
+from collections import defaultdict
+from typing import Callable, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+# --- Size Estimation ---
+
+def message_text(message: BaseMessage) -> str:
+    """Everything that goes over the wire for one message: content plus tool call arguments."""
+    text = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    if isinstance(message, AIMessage) and message.tool_calls:
+        text += json.dumps([call["args"] for call in message.tool_calls])
+    return text
+
+
+def approx_tokens(messages: list[BaseMessage]) -> int:
+    """~4 characters per token; good enough for budgeting without a tokenizer."""
+    return sum(len(message_text(m)) // 4 + 4 for m in messages)
+
+
+def payload_bytes(messages: list[BaseMessage]) -> int:
+    return sum(len(message_text(m).encode()) for m in messages)
+
+
+# --- Compaction Policy ---
+
+def _turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Splits history into turns: each AIMessage together with the ToolMessages answering it."""
+    turns: list[list[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and turns:
+            turns[-1].append(message)
+        else:
+            turns.append([message])
+    return turns
+
+
+def _stub(message: ToolMessage) -> ToolMessage:
+    return ToolMessage(
+        content=f"[stale search results omitted, {len(message_text(message))} chars]",
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+    )
+
+
+def compact_messages(
+    messages: list[BaseMessage],
+    token_budget: int,
+    count_tokens: Callable[[list[BaseMessage]], int] = approx_tokens,
+) -> list[BaseMessage]:
+    """
+    Returns a copy of `messages` that fits `token_budget`:
+    1. older tool outputs are replaced by a one-line stub (oldest first)
+    2. if that is not enough, whole older turns are dropped (oldest first)
+    The first human question and the latest turn are always kept verbatim,
+    and AI tool calls are never separated from their tool results.
+    """
+    if count_tokens(messages) <= token_budget:
+        return list(messages)
+
+    middle = _turns(messages)
+    head = [middle.pop(0)] if middle and isinstance(middle[0][0], HumanMessage) else []
+    last = [middle.pop()] if middle else []
+
+    def flatten():
+        return [m for turn in head + middle + last for m in turn]
+
+    for turn in middle:
+        turn[:] = [_stub(m) if isinstance(m, ToolMessage) else m for m in turn]
+        if count_tokens(flatten()) <= token_budget:
+            return flatten()
+
+    while middle and count_tokens(flatten()) > token_budget:
+        middle.pop(0)
+    return flatten()
+
+
+# --- Measurement ---
+
+class PayloadMeter:
+    """Records tokens and bytes sent to the model per graph node."""
+
+    def __init__(self):
+        self.per_node = defaultdict(lambda: {"calls": 0, "tokens": 0, "bytes": 0, "tokens_before_compaction": 0})
+
+    def record(self, node: str, sent: list[BaseMessage], original: Optional[list[BaseMessage]] = None) -> None:
+        stats = self.per_node[node]
+        stats["calls"] += 1
+        stats["tokens"] += approx_tokens(sent)
+        stats["bytes"] += payload_bytes(sent)
+        stats["tokens_before_compaction"] += approx_tokens(original if original is not None else sent)
+
+    def report(self) -> str:
+        lines = [f"{'node':<10} {'calls':>5} {'tokens sent':>12} {'bytes sent':>11} {'tokens saved':>13}"]
+        for node, s in self.per_node.items():
+            saved = s["tokens_before_compaction"] - s["tokens"]
+            lines.append(f"{node:<10} {s['calls']:>5} {s['tokens']:>12,} {s['bytes']:>11,} {saved:>13,}")
+        return "\n".join(lines)
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    history: list[BaseMessage] = [HumanMessage(content="How should we handle the climate crisis?")]
+    for i in range(6):
+        call_id = f"call_{i}"
+        history.append(AIMessage(
+            content="",
+            tool_calls=[{"name": "ReviseAnswer", "args": {"answer": f"Draft {i} " * 50}, "id": call_id}],
+        ))
+        history.append(ToolMessage(content="search result text " * 400, tool_call_id=call_id))
+
+    meter = PayloadMeter()
+    compacted = compact_messages(history, token_budget=2_000)
+    meter.record("revise", compacted, original=history)
+    print(f"{len(history)} messages / ~{approx_tokens(history):,} tokens "
+          f"-> {len(compacted)} messages / ~{approx_tokens(compacted):,} tokens\n")
+    print(meter.report())
@@ -0,0 +1,207 @@
+import asyncio
+import random
+import re
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import AsyncIterator, Optional, Protocol
+
+# --- Search Backends ---
+
+class SearchBackend(Protocol):
+    name: str
+
+    async def search(self, query: str) -> list[dict]:
+        ...
+
+
+class TavilyBackend:
+    """Adapts the TavilySearchResults tool used in 3_reflexion.py."""
+
+    name = "tavily"
+
+    def __init__(self, tool):
+        self.tool = tool
+
+    async def search(self, query: str) -> list[dict]:
+        return await self.tool.ainvoke({"query": query})
+
+
+class StubSearchBackend:
+    """Offline backend with fake latency; counts how many real searches it served."""
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.1):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+
+    async def search(self, query: str) -> list[dict]:
+        self.calls += 1
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        return [{"url": f"https://example.com/{i}", "content": f"Result {i} for '{query}'"} for i in range(3)]
+
+
+# --- Query Normalization and Cache ---
+
+def normalize_query(query: str) -> str:
+    """
+    Maps trivially different spellings of a query to the same key: lowercase,
+    punctuation and whitespace collapsed. Word order is kept, since
+    "flights from London to Paris" and "... from Paris to London" differ.
+    """
+    return " ".join(re.findall(r"[a-z0-9]+", query.lower())) or query.strip().lower()
+
+
+class SearchCache:
+    """In-memory normalized-query cache that outlives a single graph run."""
+
+    def __init__(self, ttl_seconds: float = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, list[dict]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, results: list[dict]) -> None:
+        self._entries[key] = (time.monotonic(), results)
+
+
+# --- Rate Limiting ---
+
+class RateLimiter:
+    """Async token bucket: at most `rate` calls per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# --- Executor ---
+
+class SearchExecutor:
+    """
+    Fans a list of queries out concurrently:
+    - queries that only differ in case / punctuation share a single search
+    - results are cached across calls by normalized query (with TTL)
+    - `max_concurrency` caps searches in flight, `rate_limits` caps calls/s per backend
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        cache: Optional[SearchCache] = None,
+        max_concurrency: int = 8,
+        rate_limits: Optional[dict[str, float]] = None,
+    ):
+        self.backend = backend
+        self.cache = cache or SearchCache()
+        self.max_concurrency = max_concurrency
+        self.rate_limits = rate_limits or {}
+        self.stats = defaultdict(int)
+        # asyncio primitives belong to one event loop, so each loop gets its own
+        self._primitives: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._primitives_lock = threading.Lock()
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _primitives_for_running_loop(self) -> tuple[asyncio.Semaphore, dict[str, RateLimiter]]:
+        loop = asyncio.get_running_loop()
+        with self._primitives_lock:
+            if loop not in self._primitives:
+                self._primitives[loop] = (
+                    asyncio.Semaphore(self.max_concurrency),
+                    {name: RateLimiter(rate) for name, rate in self.rate_limits.items()},
+                )
+            return self._primitives[loop]
+
+    async def _search(self, key: str, query: str, semaphore, limiters) -> tuple[str, list[dict]]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return key, cached
+
+        async with semaphore:
+            limiter = limiters.get(self.backend.name)
+            if limiter:
+                await limiter.acquire()
+            self.stats["backend_calls"] += 1
+            results = await self.backend.search(query)
+        self.cache.put(key, results)
+        return key, results
+
+    async def iter_results(self, queries: list[str]) -> AsyncIterator[tuple[str, list[dict]]]:
+        """Yields (query, results) in completion order, once per input query."""
+        semaphore, limiters = self._primitives_for_running_loop()
+        by_key: dict[str, list[str]] = defaultdict(list)
+        for query in queries:
+            by_key[normalize_query(query)].append(query)
+        self.stats["queries"] += len(queries)
+        self.stats["deduplicated"] += len(queries) - len(by_key)
+
+        searches = [self._search(key, originals[0], semaphore, limiters) for key, originals in by_key.items()]
+        for next_done in asyncio.as_completed(searches):
+            key, results = await next_done
+            for query in by_key[key]:
+                yield query, results
+
+    async def run(self, queries: list[str]) -> list[list[dict]]:
+        """Results in the same order as `queries` (the shape tavily_tool.batch returns)."""
+        found = {query: results async for query, results in self.iter_results(queries)}
+        return [found[query] for query in queries]
+
+    def run_sync(self, queries: list[str]) -> list[list[dict]]:
+        """
+        Blocking run() for sync callers, e.g. graph tool nodes, which may call it
+        from several threads at once. Every call runs on one background loop, so
+        the concurrency cap and rate limits hold across those threads too.
+        """
+        with self._primitives_lock:
+            if self._sync_loop is None:
+                self._sync_loop = asyncio.new_event_loop()
+                threading.Thread(target=self._sync_loop.run_forever, name="search-executor", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self.run(queries), self._sync_loop).result()
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    async def main():
+        backend = StubSearchBackend(latency=0.2)
+        executor = SearchExecutor(backend, SearchCache(ttl_seconds=600), max_concurrency=4,
+                                  rate_limits={"stub": 10})
+
+        iterations = [
+            ["climate crisis solutions", "Climate crisis: solutions?", "carbon tax effectiveness"],
+            ["Carbon tax effectiveness.", "renewable energy adoption 2024", "solutions for the climate crisis"],
+            ["renewable energy adoption 2024", "carbon capture cost"],
+        ]
+        start = time.perf_counter()
+        for i, queries in enumerate(iterations, 1):
+            async for query, results in executor.iter_results(queries):
+                print(f"iteration {i}: {query!r} -> {len(results)} results")
+        print(f"\n{time.perf_counter() - start:.2f}s, backend calls: {backend.calls}, stats: {dict(executor.stats)}")
+
+    asyncio.run(main())
@@ -1,30 +1,31 @@
 import os
-from dotenv import load_dotenv
+from functools import cache
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
-# --- Configuration ---
-# Load environment variables from .env file (for GOOGLE_API_KEY)
-load_dotenv()
+import lazy
 
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError(
-        "GOOGLE_API_KEY not found in .env file. Please add it."
-    )
+# --- Configuration ---
+@cache
+def get_llm():
+    # Load environment variables from .env file (for GOOGLE_API_KEY)
+    lazy.load_env()
+
+    if not os.getenv("GOOGLE_API_KEY"):
+        raise ValueError(
+            "GOOGLE_API_KEY not found in .env file. Please add it."
+        )
 
-# Initialize the Chat LLM (Gemini)
-# Lower temperature for deterministic reasoning
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.1,
-)
+    # Initialize the Chat LLM (Gemini)
+    # Lower temperature for deterministic reasoning
+    return lazy.gemini("gemini-2.5-flash", temperature=0.1)
 
 def run_reflection_loop():
     """
     Demonstrates a multi-step AI reflection loop to progressively
     improve a Python function.
     """
+    llm = get_llm()
 
     # --- The Core Task ---
     task_prompt = """
@@ -0,0 +1,261 @@
+import asyncio
+import difflib
+import os
+import re
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+# --- The Core Task (same as 3_reflexion_simple.py) ---
+TASK_PROMPT = """
+Your task is to create a Python function named `calculate_factorial`.
+
+This function should:
+1. Accept a single integer `n` as input.
+2. Calculate its factorial (n!).
+3. Include a clear docstring explaining what the function does.
+4. Handle edge cases: The factorial of 0 is 1.
+5. Handle invalid input: Raise a ValueError if the input is a negative number.
+"""
+
+TASK_TESTS = """
+assert calculate_factorial(0) == 1
+assert calculate_factorial(1) == 1
+assert calculate_factorial(5) == 120
+try:
+    calculate_factorial(-1)
+except ValueError:
+    pass
+else:
+    raise AssertionError("negative input must raise ValueError")
+"""
+
+REFLECTOR_PROMPT = """
+You are a senior software engineer and an expert in Python.
+Your role is to perform a meticulous code review.
+
+Critically evaluate the provided Python code based on the original task.
+Look for bugs, style issues, missing edge cases, and areas for improvement.
+
+If the code is perfect and meets all requirements,
+respond with the single phrase: CODE_IS_PERFECT
+
+Otherwise, provide a bulleted list of critiques.
+"""
+
+
+# --- Local Checks ---
+
+def extract_code(text: str) -> str:
+    """Returns the first ```python block, or the whole text if there is none."""
+    match = re.search(r"```(?:python)?\n(.*?)```", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+async def run_tests_in_sandbox(code: str, tests: str, timeout: float = 10.0) -> tuple[bool, str]:
+    """
+    Compiles `code` and runs `tests` against it in a separate, isolated
+    Python process. Returns (passed, output). The event loop stays free while
+    the tests run, so in-flight model calls keep making progress.
+    """
+    try:
+        compile(code, "<candidate>", "exec")
+    except SyntaxError as e:
+        return False, f"SyntaxError: {e}"
+
+    fd, path = tempfile.mkstemp(suffix=".py")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(code + "\n\n" + tests)
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-I", path,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            return False, f"Timed out after {timeout}s"
+        finally:
+            # Timed out or cancelled: never leave the child running
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        return process.returncode == 0, (stdout + stderr).decode(errors="replace")[-2000:]
+    finally:
+        os.remove(path)
+
+
+def is_perfect(critique: str) -> bool:
+    """Stricter than a substring check: the verdict must be the whole answer."""
+    return critique.strip().strip("*`.").upper() == "CODE_IS_PERFECT"
+
+
+# --- Diff-Based Context ---
+# Instead of resending the whole message history, the generator sees the task,
+# the current code, what changed since the previous version and the newest feedback.
+
+def refine_messages(current: str, previous: str, feedback: str) -> list:
+    diff = "\n".join(difflib.unified_diff(
+        previous.splitlines(), current.splitlines(), "previous", "current", lineterm=""
+    )) or "(first version)"
+    return [
+        HumanMessage(content=TASK_PROMPT),
+        HumanMessage(content=(
+            f"Current code:\n```python\n{current}\n```\n\n"
+            f"Changes since the previous version:\n{diff}\n\n"
+            f"Feedback:\n{feedback}\n\n"
+            "Please refine the code using this feedback. Reply with the full code."
+        )),
+    ]
+
+
+def critique_messages(code: str) -> list:
+    return [
+        SystemMessage(content=REFLECTOR_PROMPT),
+        HumanMessage(content=f"Original Task:\n{TASK_PROMPT}\n\nCode to Review:\n{code}"),
+    ]
+
+
+# --- Runner ---
+
+@dataclass
+class ReflectionReport:
+    code: str
+    iterations: int
+    model_calls: int
+    seconds: float
+    stopped_by: str
+    speculative_hits: int = 0
+    log: list = field(default_factory=list)
+
+
+async def run_reflection(
+    llm: BaseChatModel,
+    tests: str = TASK_TESTS,
+    max_iterations: int = 3,
+    speculative: bool = True,
+    early_exit: bool = True,
+) -> ReflectionReport:
+    """
+    Generate → (test) → critique loop.
+    - early_exit: stop as soon as the code compiles and passes `tests`
+    - speculative: while version N is being critiqued, version N+1 is already
+      generated from the test output alone; it is kept if it passes the tests,
+      otherwise it is regenerated with the critique
+    """
+    start = time.perf_counter()
+    calls = 0
+    iterations = 0
+    speculative_hits = 0
+    log = []
+
+    async def call(messages):
+        nonlocal calls
+        calls += 1
+        return (await llm.ainvoke(messages)).content
+
+    code = extract_code(await call([HumanMessage(content=TASK_PROMPT)]))
+    previous = ""
+    stopped_by = "max_iterations"
+
+    for i in range(max_iterations):
+        passed, test_output = await run_tests_in_sandbox(code, tests)
+        iterations += 1
+        log.append(f"v{i + 1}: tests {'passed' if passed else 'failed'}")
+        if early_exit and passed:
+            stopped_by = "tests_passed"
+            break
+
+        critique_task = asyncio.create_task(call(critique_messages(code)))
+        speculative_task = None
+        if speculative and not passed and i + 1 < max_iterations:
+            speculative_task = asyncio.create_task(
+                call(refine_messages(code, previous, f"Test output:\n{test_output}"))
+            )
+
+        try:
+            critique = await critique_task
+            # The reviewer's verdict only counts for code that also passed the tests
+            if passed and is_perfect(critique):
+                stopped_by = "critique_perfect"
+                break
+            if i + 1 == max_iterations:
+                break
+
+            if speculative_task:
+                candidate = extract_code(await speculative_task)
+                if (await run_tests_in_sandbox(candidate, tests))[0]:
+                    speculative_hits += 1
+                    log.append(f"v{i + 2}: speculative version accepted")
+                    previous, code = code, candidate
+                    continue
+
+            feedback = f"Critique:\n{critique}\n\nTest output:\n{test_output}"
+            previous, code = code, extract_code(await call(refine_messages(code, previous, feedback)))
+        finally:
+            # On early exit, an error or cancellation, no model call is left running in the background
+            running = [t for t in (critique_task, speculative_task) if t is not None and not t.done()]
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return ReflectionReport(
+        code=code,
+        iterations=iterations,
+        model_calls=calls,
+        seconds=time.perf_counter() - start,
+        stopped_by=stopped_by,
+        speculative_hits=speculative_hits,
+        log=log,
+    )
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    from fake_llm import LocalFakeChatModel
+
+    BUGGY = '''```python
+def calculate_factorial(n):
+    """Returns n!."""
+    result = 1
+    for i in range(1, n):
+        result *= i
+    return result
+```'''
+
+    FIXED = '''```python
+def calculate_factorial(n):
+    """Returns n! for a non-negative integer n; raises ValueError for negative n."""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+```'''
+
+    def fake_responder(messages):
+        if isinstance(messages[0], SystemMessage):
+            return "- The loop stops one step early.\n- Negative input is not rejected."
+        return BUGGY if len(messages) == 1 else FIXED
+
+    async def main():
+        reports = {}
+        for label, kwargs in [
+            ("sequential, no early exit", {"speculative": False, "early_exit": False}),
+            ("speculative + early exit", {"speculative": True, "early_exit": True}),
+        ]:
+            llm = LocalFakeChatModel(respond=fake_responder, latency=0.5)
+            reports[label] = report = await run_reflection(llm, **kwargs)
+            print(f"{label:<27} calls={report.model_calls} time={report.seconds:.2f}s "
+                  f"stopped_by={report.stopped_by} log={report.log}")
+
+        baseline, fast = reports.values()
+        print(f"\nSaved per task: {baseline.model_calls - fast.model_calls} model calls, "
+              f"{baseline.seconds - fast.seconds:.2f}s wall-clock")
+
+    asyncio.run(main())
@@ -1,7 +1,6 @@
 import asyncio
-from typing import Optional
+from functools import cache
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import (
@@ -9,62 +8,40 @@ from langchain_core.runnables import (
     RunnableParallel,
     RunnablePassthrough,
 )
-from dotenv import load_dotenv
 
-load_dotenv()
+import lazy
+
 # --- Configuration ---
-# Ensure your GOOGLE_API_KEY environment variable is set
+# Ensure your GOOGLE_API_KEY environment variable is set.
+# The model is only created on first use of get_llm() (or `llm`, see bottom).
 
-try:
-    llm: Optional[ChatGoogleGenerativeAI] = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0,
-    )
-except Exception as e:
-    print(f"Error initializing language model: {e}")
-    llm = None
-
-# --- Define Independent Chains (Parallel Tasks) ---
-
-summarize_chain: Runnable = (
-    ChatPromptTemplate.from_messages([
-        ("system", "Summarize the following topic concisely:"),
-        ("user", "{topic}")
-    ])
-    | llm
-    | StrOutputParser()
-)
+@cache
+def get_llm():
+    try:
+        return lazy.gemini("gemini-2.5-flash", temperature=0)
+    except Exception as e:
+        print(f"Error initializing language model: {e}")
+        return None
 
-questions_chain: Runnable = (
-    ChatPromptTemplate.from_messages([
-        ("system", "Generate three interesting questions about the following topic:"),
-        ("user", "{topic}")
-    ])
-    | llm
-    | StrOutputParser()
-)
+# --- Define Independent Prompts (Parallel Tasks) ---
 
-terms_chain: Runnable = (
-    ChatPromptTemplate.from_messages([
-        (
-            "system",
-            "Identify 5–10 key terms from the following topic, separated by commas:"
-        ),
-        ("user", "{topic}")
-    ])
-    | llm
-    | StrOutputParser()
-)
+summarize_prompt = ChatPromptTemplate.from_messages([
+    ("system", "Summarize the following topic concisely:"),
+    ("user", "{topic}")
+])
 
-# --- Parallel Map Step ---
-map_chain = RunnableParallel(
-    {
-        "summary": summarize_chain,
-        "questions": questions_chain,
-        "key_terms": terms_chain,
-        "topic": RunnablePassthrough(),
-    }
-)
+questions_prompt = ChatPromptTemplate.from_messages([
+    ("system", "Generate three interesting questions about the following topic:"),
+    ("user", "{topic}")
+])
+
+terms_prompt = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        "Identify 5–10 key terms from the following topic, separated by commas:"
+    ),
+    ("user", "{topic}")
+])
 
 # --- Synthesis Step ---
 synthesis_prompt = ChatPromptTemplate.from_messages([
@@ -80,17 +57,40 @@ Synthesize a comprehensive answer."""
     ("user", "Original topic: {topic}")
 ])
 
-# --- Full Chain ---
-full_parallel_chain = (
-    map_chain
-    | synthesis_prompt
-    | llm
-    | StrOutputParser()
-)
+
+def build_branch_chains(llm) -> dict[str, Runnable]:
+    """The three independent chains, keyed by the synthesis prompt variable they fill."""
+    return {
+        "summary": summarize_prompt | llm | StrOutputParser(),
+        "questions": questions_prompt | llm | StrOutputParser(),
+        "key_terms": terms_prompt | llm | StrOutputParser(),
+    }
+
+
+def build_full_parallel_chain(llm) -> Runnable:
+    # --- Parallel Map Step ---
+    map_chain = RunnableParallel(
+        {**build_branch_chains(llm), "topic": RunnablePassthrough()}
+    )
+    # --- Full Chain ---
+    return map_chain | synthesis_prompt | llm | StrOutputParser()
+
+
+# full_parallel_chain is None if the llm fails to initialize
+@cache
+def get_full_parallel_chain():
+    llm = get_llm()
+    return build_full_parallel_chain(llm) if llm else None
+
+__getattr__ = lazy.lazy_attributes(globals(), {
+    "llm": get_llm,
+    "full_parallel_chain": get_full_parallel_chain,
+})
 
 # --- Run the Chain ---
 async def run_parallel_example(topic: str) -> None:
-    if not llm:
+    full_parallel_chain = get_full_parallel_chain()
+    if not full_parallel_chain:
         print("LLM not initialized. Cannot run example.")
         return
 
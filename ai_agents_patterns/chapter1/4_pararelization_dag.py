@@ -0,0 +1,219 @@
+import asyncio
+import importlib
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.runnables import Runnable
+
+# Prompts and chain builders live in 4_pararelization.py
+pararelization = importlib.import_module("4_pararelization")
+
+
+# --- Graph Definition ---
+
+@dataclass
+class Node:
+    """
+    One step of the per-topic graph. A node without deps receives the topic;
+    otherwise it receives {"topic": ..., <dep>: <dep output>, ...}.
+    If `fallback` is set, a timeout or error yields it instead of failing the topic.
+    """
+    runnable: Runnable
+    deps: tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    fallback: Optional[Any] = None
+
+
+@dataclass
+class NodeTiming:
+    ready: float     # all deps finished (seconds since the topic started)
+    started: float   # concurrency slot acquired
+    finished: float
+    status: str      # "ok", "timeout" or "error"
+
+
+def build_topic_graph(
+    branches: dict[str, Runnable],
+    synthesis: Runnable,
+    branch_timeout: Optional[float] = None,
+) -> dict[str, Node]:
+    """The graph behind full_parallel_chain: independent branches → synthesis."""
+    nodes = {
+        name: Node(chain, timeout=branch_timeout, fallback=f"({name} unavailable)")
+        for name, chain in branches.items()
+    }
+    nodes["synthesis"] = Node(synthesis, deps=tuple(branches))
+    return nodes
+
+
+def _topological_order(nodes: dict[str, Node]) -> list[str]:
+    order, state = [], {}
+
+    def visit(name: str) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Cycle in graph at node '{name}'")
+        if name not in nodes:
+            raise ValueError(f"Unknown dependency '{name}'")
+        state[name] = "visiting"
+        for dep in nodes[name].deps:
+            visit(dep)
+        state[name] = "done"
+        order.append(name)
+
+    for name in nodes:
+        visit(name)
+    return order
+
+
+# --- Executor ---
+
+async def _cancel_all(tasks) -> None:
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+class DagExecutor:
+    """
+    Runs the node graph for many topics at once.
+    - every node starts as soon as its own deps are done (no stage barrier
+      across topics: topic A's synthesis does not wait for topic B's branches)
+    - one semaphore caps model calls in flight across all topics
+    - `Node.timeout` only counts time spent running, not time queued for a slot
+    """
+
+    def __init__(self, nodes: dict[str, Node], max_concurrency: int = 8):
+        self.nodes = nodes
+        self.max_concurrency = max_concurrency
+        self._order = _topological_order(nodes)
+        # A semaphore belongs to one event loop, so each loop gets its own (see SearchExecutor)
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    def _semaphore_for_running_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            if loop not in self._semaphores:
+                self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return self._semaphores[loop]
+
+    async def _run_node(self, name: str, topic: str, tasks: dict, timings: dict, origin: float, semaphore):
+        node = self.nodes[name]
+        dep_values = [await tasks[dep] for dep in node.deps]
+        inputs = {"topic": topic, **dict(zip(node.deps, dep_values))} if node.deps else topic
+        ready = time.perf_counter() - origin
+
+        async with semaphore:
+            started = time.perf_counter() - origin
+            error, status = None, "ok"
+            try:
+                value = await asyncio.wait_for(node.runnable.ainvoke(inputs), node.timeout)
+            except asyncio.TimeoutError as e:
+                error, status = e, "timeout"
+            except Exception as e:
+                error, status = e, "error"
+        timings[name] = NodeTiming(ready, started, time.perf_counter() - origin, status)
+
+        if error is not None:
+            if node.fallback is None:
+                raise error
+            value = node.fallback
+        return value
+
+    async def run(self, topic: str) -> tuple[dict[str, Any], dict[str, NodeTiming]]:
+        """Returns (outputs by node, timings by node) for one topic."""
+        semaphore = self._semaphore_for_running_loop()
+        origin = time.perf_counter()
+        tasks: dict[str, asyncio.Task] = {}
+        timings: dict[str, NodeTiming] = {}
+        for name in self._order:
+            tasks[name] = asyncio.create_task(self._run_node(name, topic, tasks, timings, origin, semaphore))
+        try:
+            results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        except asyncio.CancelledError:
+            # The caller was cancelled: stop every node of this topic instead of orphaning them
+            await _cancel_all(tasks.values())
+            raise
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(tasks, results)), timings
+
+    async def run_many(self, topics: list[str]) -> AsyncIterator[tuple[str, Optional[dict], dict, Optional[Exception]]]:
+        """Yields (topic, outputs, timings, error) in completion order."""
+        async def one(topic):
+            try:
+                outputs, timings = await self.run(topic)
+                return topic, outputs, timings, None
+            except Exception as e:
+                return topic, None, {}, e
+
+        tasks = [asyncio.create_task(one(topic)) for topic in topics]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Cancelled, or the consumer stopped iterating early: don't leave topics running
+            await _cancel_all(tasks)
+
+    def critical_path(self, timings: dict[str, NodeTiming]) -> list[str]:
+        """Walks back from the last node to finish through the dep that finished last."""
+        if not timings:
+            return []
+        name = max(timings, key=lambda n: timings[n].finished)
+        path = [name]
+        while deps := [d for d in self.nodes[name].deps if d in timings]:
+            name = max(deps, key=lambda d: timings[d].finished)
+            path.append(name)
+        return path[::-1]
+
+    def format_breakdown(self, topic: str, timings: dict[str, NodeTiming]) -> str:
+        path = self.critical_path(timings)
+        total = timings[path[-1]].finished if path else 0.0
+        steps = [
+            f"{name} (wait {t.started - t.ready:.2f}s, run {t.finished - t.started:.2f}s"
+            f"{'' if t.status == 'ok' else ', ' + t.status})"
+            for name in path for t in [timings[name]]
+        ]
+        return f"{topic!r}: {total:.2f}s = " + " → ".join(steps)
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    from langchain_core.output_parsers import StrOutputParser
+
+    from fake_llm import LocalFakeChatModel
+
+    def fake_model(latency: float) -> LocalFakeChatModel:
+        return LocalFakeChatModel(
+            respond=lambda messages: f"[{messages[0].content[:30]}...] {messages[-1].content[:40]}",
+            latency=latency,
+        )
+
+    # Key-term extraction is deliberately slow to trigger the partial-result fallback
+    branches = {
+        "summary": pararelization.summarize_prompt | fake_model(0.3) | StrOutputParser(),
+        "questions": pararelization.questions_prompt | fake_model(0.5) | StrOutputParser(),
+        "key_terms": pararelization.terms_prompt | fake_model(2.0) | StrOutputParser(),
+    }
+    synthesis = pararelization.synthesis_prompt | fake_model(0.4) | StrOutputParser()
+
+    executor = DagExecutor(build_topic_graph(branches, synthesis, branch_timeout=1.0), max_concurrency=12)
+    topics = [f"Topic {i}: the history of space exploration" for i in range(8)]
+
+    async def main():
+        start = time.perf_counter()
+        async for topic, outputs, timings, error in executor.run_many(topics):
+            if error:
+                print(f"{topic!r} failed: {error!r}")
+            else:
+                print(executor.format_breakdown(topic, timings))
+        print(f"\n{len(topics)} topics in {time.perf_counter() - start:.2f}s")
+
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+import asyncio
+import importlib
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Union
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable
+
+# Prompts and chain builders live in 4_pararelization.py
+pararelization = importlib.import_module("4_pararelization")
+
+
+# --- Event Types ---
+# `elapsed` is always seconds since the stream started.
+
+@dataclass
+class BranchCompleted:
+    name: str       # "summary", "questions" or "key_terms"
+    output: str
+    elapsed: float
+
+
+@dataclass
+class SynthesisToken:
+    text: str
+    elapsed: float
+
+
+@dataclass
+class StreamFinished:
+    answer: str
+    ttft: float     # time to the first synthesis token
+    total: float
+
+
+StreamEvent = Union[BranchCompleted, SynthesisToken, StreamFinished]
+
+
+# --- Streaming Runner ---
+
+async def stream_parallel(
+    topic: str,
+    branches: dict[str, Runnable],
+    synthesis: Runnable,
+) -> AsyncIterator[StreamEvent]:
+    """
+    Streaming counterpart of full_parallel_chain.ainvoke(topic):
+    each branch output is yielded as soon as that branch finishes, then the
+    synthesis answer is yielded token by token via `astream`.
+    """
+    start = time.perf_counter()
+
+    async def run_branch(name, chain):
+        return name, await chain.ainvoke(topic)
+
+    outputs = {"topic": topic}
+    for next_done in asyncio.as_completed([run_branch(n, c) for n, c in branches.items()]):
+        name, output = await next_done
+        outputs[name] = output
+        yield BranchCompleted(name, output, time.perf_counter() - start)
+
+    ttft, parts = None, []
+    async for chunk in synthesis.astream(outputs):
+        elapsed = time.perf_counter() - start
+        ttft = elapsed if ttft is None else ttft
+        parts.append(chunk)
+        yield SynthesisToken(chunk, elapsed)
+
+    total = time.perf_counter() - start
+    yield StreamFinished("".join(parts), ttft if ttft is not None else total, total)
+
+
+def build_streaming_chains(llm) -> tuple[dict[str, Runnable], Runnable]:
+    """(branches, synthesis) for stream_parallel, using the prompts of 4_pararelization.py."""
+    synthesis = pararelization.synthesis_prompt | llm | StrOutputParser()
+    return pararelization.build_branch_chains(llm), synthesis
+
+
+async def run_streaming_example(llm, topic: str) -> tuple[float, StreamFinished]:
+    """Prints the events as they arrive; returns (time to the first event, the final event)."""
+    branches, synthesis = build_streaming_chains(llm)
+    first_event, finished = None, None
+    async for event in stream_parallel(topic, branches, synthesis):
+        if first_event is None:
+            first_event = event.elapsed if not isinstance(event, StreamFinished) else event.total
+        if isinstance(event, BranchCompleted):
+            print(f"\n[{event.elapsed:.2f}s] {event.name}: {event.output}")
+        elif isinstance(event, SynthesisToken):
+            print(event.text, end="", flush=True)
+        else:
+            finished = event
+    print(f"\n\nTTFT: {finished.ttft:.2f}s, total: {finished.total:.2f}s")
+    return first_event, finished
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    from fake_llm import LocalFakeChatModel
+
+    topic = "The history of space exploration"
+
+    def fake_answer(messages):
+        if messages[0].content.startswith("Based on"):
+            return "Space exploration began with " + " ".join(["rockets"] * 30)
+        return f"({messages[0].content.split()[0].lower()} output)"
+
+    # 0.5s before the first token, then 50 ms per streamed word
+    llm = LocalFakeChatModel(respond=fake_answer, latency=0.5, token_latency=0.05)
+
+    async def main():
+        chain = pararelization.build_full_parallel_chain(llm)
+
+        # Baseline 1: the old example, a blocking call, has nothing to show until it returns
+        start = time.perf_counter()
+        await chain.ainvoke(topic)
+        blocking_total = time.perf_counter() - start
+
+        # Baseline 2: astream on the same chain streams the synthesis, but not the branches
+        start, chain_first = time.perf_counter(), None
+        async for _ in chain.astream(topic):
+            chain_first = chain_first or time.perf_counter() - start
+        chain_total = time.perf_counter() - start
+
+        first_event, finished = await run_streaming_example(llm, topic)
+        print(f"\n{'variant':<28} {'first output':>12} {'total':>7}")
+        print(f"{'ainvoke (blocking)':<28} {blocking_total:>11.2f}s {blocking_total:>6.2f}s")
+        print(f"{'chain.astream':<28} {chain_first:>11.2f}s {chain_total:>6.2f}s")
+        print(f"{'stream_parallel':<28} {first_event:>11.2f}s {finished.total:>6.2f}s"
+              f"  (first synthesis token {finished.ttft:.2f}s)")
+
+    asyncio.run(main())
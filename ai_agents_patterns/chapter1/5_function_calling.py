@@ -1,32 +1,31 @@
 import os
 import getpass
 import asyncio
-import nest_asyncio
+import importlib
 
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.tools import tool as langchain_tool
-from langchain.agents import create_agent
 
-# --- Environment Setup ---
-load_dotenv()
+import lazy
 
-# Securely prompt for API keys if not already set
-if not os.getenv("GOOGLE_API_KEY"):
-    os.environ["GOOGLE_API_KEY"] = getpass.getpass(
-        "Enter your Google API key: "
-    )
+# Index and tool runtime live in 5_function_calling_tools.py, the executor in 5_function_calling_executor.py
+function_calling_tools = importlib.import_module("5_function_calling_tools")
+function_calling_executor = importlib.import_module("5_function_calling_executor")
 
-# --- Initialize LLM ---
-try:
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash",
-        temperature=0,
-    )
-    print(f"✅ Language model initialized: {llm.model}")
-except Exception as e:
-    print(f"🛑 Error initializing language model: {e}")
-    llm = None
+# --- Knowledge Base (indexed once at import, not on every tool call) ---
+KNOWLEDGE_BASE = {
+    "weather in london": (
+        "The weather in London is currently cloudy "
+        "with a temperature of 15°C."
+    ),
+    "capital of france": "The capital of France is Paris.",
+    "population of earth": (
+        "The estimated population of Earth is around 8 billion people."
+    ),
+    "tallest mountain": (
+        "Mount Everest is the tallest mountain above sea level."
+    ),
+}
+knowledge_index = function_calling_tools.KnowledgeIndex(KNOWLEDGE_BASE)
 
 # --- Define Tool ---
 @langchain_tool
@@ -37,72 +36,77 @@ def search_information(query: str) -> str:
     - capital of France
     - weather in London
     """
-    print(
-        f"\n--- 🔧 Tool Called: search_information "
-        f"with query: '{query}' ---"
-    )
-
-    simulated_results = {
-        "weather in london": (
-            "The weather in London is currently cloudy "
-            "with a temperature of 15°C."
-        ),
-        "capital of france": "The capital of France is Paris.",
-        "population of earth": (
-            "The estimated population of Earth is around 8 billion people."
-        ),
-        "tallest mountain": (
-            "Mount Everest is the tallest mountain above sea level."
-        ),
-    }
-
-    result = simulated_results.get(
-        query.lower(),
+    result, _ = knowledge_index.lookup(query)
+    return result or (
         f"Simulated search result for '{query}': "
         "No specific information found, but the topic seems interesting."
     )
 
-    print(f"--- 🔍 TOOL RESULT: {result} ---")
-    return result
+# search_information is pure, so repeated queries are served from the runtime's LRU
+tool_runtime = function_calling_tools.ToolRuntime()
+tool_runtime.register(search_information, pure=True)
+tools = tool_runtime.tools
+
+
+def build_agent():
+    """Initializes the LLM (prompting for the API key if needed) and the agent."""
+    from langchain.agents import create_agent
+
+    lazy.load_env()
 
-tools = [search_information]
+    # Securely prompt for API keys if not already set
+    if not os.getenv("GOOGLE_API_KEY"):
+        os.environ["GOOGLE_API_KEY"] = getpass.getpass(
+            "Enter your Google API key: "
+        )
+
+    try:
+        llm = lazy.gemini("gemini-2.0-flash", temperature=0)
+        print(f"✅ Language model initialized: {llm.model}")
+    except Exception as e:
+        print(f"🛑 Error initializing language model: {e}")
+        return None
 
-# --- Create Agent ---
-if llm:
-    agent = create_agent(
+    return create_agent(
         model=llm,
         tools=tools,
         system_prompt="You are a helpful assistant."
     )
 
 # --- Async Runner ---
-async def run_agent_with_tool(query: str):
-    """Run the agent with a single query."""
-    print(f"\n--- 🏃 Running Agent with Query: '{query}' ---")
-    try:
-        response = await agent.ainvoke(
-            {"messages": [{"role": "user", "content": query}]}
-        )
-        print("\n--- ✅ Final Agent Response ---")
+def print_response(query: str, response) -> None:
+    """Prints the final answer of one agent run (or the error it ended with)."""
+    print(f"\n--- ✅ Final Agent Response for '{query}' ---")
+    if isinstance(response, Exception):
+        print(f"🛑 Agent execution error: {response}")
+    elif "messages" in response:
         # Extract the last message content from the response
-        if "messages" in response:
-            last_message = response["messages"][-1]
-            print(last_message.content if hasattr(last_message, "content") else last_message)
-        else:
-            print(response)
-    except Exception as e:
-        print(f"\n🛑 Agent execution error: {e}")
+        last_message = response["messages"][-1]
+        print(last_message.content if hasattr(last_message, "content") else last_message)
+    else:
+        print(response)
 
 async def main():
-    """Run multiple agent queries concurrently."""
-    tasks = [
-        run_agent_with_tool("What is the capital of France?"),
-        run_agent_with_tool("What's the weather like in London?"),
-        run_agent_with_tool("Tell me something about dogs."),
+    """Run multiple agent queries through a capped, retrying executor."""
+    queries = [
+        "What is the capital of France?",
+        "What's the weather like in London?",
+        "Tell me something about dogs.",
     ]
-    await asyncio.gather(*tasks)
+    # ChatGoogleGenerativeAI keeps its own connection pool and cannot use an
+    # external httpx client, so the executor only caps concurrency and retries;
+    # the agent is still built once and shared by every query.
+    async with function_calling_executor.AgentExecutor(
+        lambda _client: build_agent(), max_concurrency=8, http_client=False
+    ) as executor:
+        if executor.agent is None:
+            return
+        report = await executor.run(
+            queries, on_result=lambda index, response: print_response(queries[index], response)
+        )
+    print(f"\n--- Executor stats ---\n{report}")
 
 # --- Entry Point ---
 if __name__ == "__main__":
-    nest_asyncio.apply()
     asyncio.run(main())
+    print(f"\n--- Tool stats ---\n{tool_runtime.stats()}")
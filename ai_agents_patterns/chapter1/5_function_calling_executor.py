@@ -0,0 +1,330 @@
+import asyncio
+import json
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+
+
+# --- Rate-Limit Detection ---
+
+class RateLimitError(Exception):
+    pass
+
+
+def agent_input(query: str) -> dict:
+    """Input format of agents built with `create_agent`."""
+    return {"messages": [{"role": "user", "content": query}]}
+
+
+# Error types whose message may be the only place the status shows up
+# (langchain_google_genai wraps google.genai errors into its own exception)
+_PROVIDER_MODULES = ("google.", "langchain_google_genai")
+_RATE_LIMIT_MESSAGE = re.compile(r"\b429\b|\bRESOURCE_EXHAUSTED\b")
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """HTTP 429 from our own client, or Gemini's RESOURCE_EXHAUSTED / 429 errors."""
+    if isinstance(error, RateLimitError):
+        return True
+    response = getattr(error, "response", None)
+    for status in (getattr(error, "status_code", None), getattr(response, "status_code", None),
+                   getattr(error, "code", None)):
+        if status == 429:
+            return True
+    if getattr(error, "status", None) == "RESOURCE_EXHAUSTED":
+        return True
+    # Message matching only for provider errors, so e.g. ValueError("... index 1429") is not retried
+    if type(error).__module__.startswith(_PROVIDER_MODULES):
+        return bool(_RATE_LIMIT_MESSAGE.search(str(error)))
+    return False
+
+
+# --- Reporting ---
+
+def summarize(latencies: list[float], seconds: float, failures: int = 0, retries: int = 0) -> dict:
+    latencies = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        "queries": len(latencies),
+        "failures": failures,
+        "retries": retries,
+        "seconds": seconds,
+        "queries_per_s": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+# --- Executor ---
+
+class AgentExecutor:
+    """
+    Runs many agent queries against one shared, pooled HTTP client.
+    - `agent_factory(client)` is called once per executor, so every query
+      reuses the same agent and keep-alive connections
+    - with `http_client=False` no httpx client is created and the factory gets
+      None, for models that keep their own connection pool (ChatGoogleGenerativeAI
+      builds its google.genai client internally and cannot take one from outside)
+    - a semaphore caps requests in flight; `run` feeds them from a bounded
+      queue so producers are slowed down instead of piling up tasks
+    - rate-limit errors are retried with full-jitter exponential backoff
+
+        async with AgentExecutor(build_agent, max_concurrency=32) as executor:
+            report = await executor.run(queries)
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[Optional[httpx.AsyncClient]], Runnable],
+        max_concurrency: int = 32,
+        max_retries: int = 6,
+        base_delay: float = 0.1,
+        max_delay: float = 10.0,
+        to_input: Callable[[str], Any] = agent_input,
+        http_client: bool = True,
+    ):
+        self.agent_factory = agent_factory
+        self.http_client = http_client
+        self.to_input = to_input
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.client: Optional[httpx.AsyncClient] = None
+        self.agent: Optional[Runnable] = None
+        self._semaphore = None
+        self.retries = 0
+        self.latencies: list[float] = []
+
+    async def __aenter__(self) -> "AgentExecutor":
+        if self.http_client:
+            limits = httpx.Limits(max_connections=self.max_concurrency,
+                                  max_keepalive_connections=self.max_concurrency)
+            self.client = httpx.AsyncClient(limits=limits, timeout=60.0)
+        self.agent = self.agent_factory(self.client)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def ainvoke(self, query: str) -> Any:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    return await self.agent.ainvoke(self.to_input(query))
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limit_error(e):
+                    raise
+            # Full jitter: spreads retries out so throttled callers don't come back in lockstep
+            self.retries += 1
+            await asyncio.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    async def run(self, queries: Iterable[str], on_result: Optional[Callable[[int, Any], None]] = None) -> dict:
+        """Processes `queries` (any iterable, consumed lazily) and returns a throughput/latency report."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        latencies: list[float] = []
+        failures = 0
+        retries_before = self.retries
+
+        async def producer():
+            for item in enumerate(queries):
+                await queue.put(item)
+            for _ in range(self.max_concurrency):
+                await queue.put(None)
+
+        async def worker():
+            nonlocal failures
+            while (item := await queue.get()) is not None:
+                index, query = item
+                start = time.perf_counter()
+                try:
+                    result = await self.ainvoke(query)
+                except Exception as e:
+                    failures += 1
+                    result = e
+                latencies.append(time.perf_counter() - start)
+                if on_result:
+                    on_result(index, result)
+
+        start = time.perf_counter()
+        await asyncio.gather(producer(), *(worker() for _ in range(self.max_concurrency)))
+        self.latencies = latencies
+        return summarize(latencies, time.perf_counter() - start, failures, self.retries - retries_before)
+
+
+# --- Multi-Process Sharding ---
+# One event loop saturates a CPU core at a few hundred requests/s (LangChain
+# callbacks + HTTP parsing). Past that, queries are sharded over processes, each
+# with its own executor and connection pool reused for its whole shard.
+
+def _run_shard(agent_factory, queries: list[str], executor_kwargs: dict) -> tuple[list[float], int, int]:
+    async def shard():
+        async with AgentExecutor(agent_factory, **executor_kwargs) as executor:
+            report = await executor.run(queries)
+            return executor.latencies, report["failures"], report["retries"]
+
+    return asyncio.run(shard())
+
+
+async def run_sharded(agent_factory, queries: list[str], processes: int, **executor_kwargs) -> dict:
+    """Like `AgentExecutor.run`, split round-robin over `processes` worker processes.
+    `agent_factory` must be picklable (a module-level function or a functools.partial of one)."""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        shards = await asyncio.gather(*(
+            loop.run_in_executor(pool, _run_shard, agent_factory, queries[i::processes], executor_kwargs)
+            for i in range(processes)
+        ))
+    return summarize(
+        [latency for latencies, _, _ in shards for latency in latencies],
+        time.perf_counter() - start,
+        sum(failures for _, failures, _ in shards),
+        sum(retries for _, _, retries in shards),
+    )
+
+
+# --- Local Fake Model Server (for benchmarking) ---
+
+class FakeModelServer:
+    """
+    Minimal HTTP/1.1 keep-alive server answering POST /chat with JSON.
+    Answers 429 when more than `capacity` requests are in flight, like a
+    rate-limited model API, and counts TCP connections opened.
+    """
+
+    def __init__(self, latency: float = 0.05, capacity: int = 64, host: str = "127.0.0.1"):
+        self.latency = latency
+        self.capacity = capacity
+        self.host = host
+        self.port = None
+        self.in_flight = 0
+        self.connections = 0
+        self.requests = 0
+        self.throttled = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/chat"
+
+    async def __aenter__(self) -> "FakeModelServer":
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))) or b"{}")
+                self.requests += 1
+
+                if self.in_flight >= self.capacity:
+                    self.throttled += 1
+                    status, payload = "429 Too Many Requests", {"error": "rate limited"}
+                else:
+                    self.in_flight += 1
+                    try:
+                        await asyncio.sleep(self.latency)
+                    finally:
+                        self.in_flight -= 1
+                    question = body.get("messages", [{}])[-1].get("content", "")
+                    status, payload = "200 OK", {"content": f"Answer to: {question}"}
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class HttpChatModel(BaseChatModel):
+    """Chat model talking to FakeModelServer through a shared httpx.AsyncClient."""
+
+    url: str
+    client: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "http-chat-model"
+
+    @staticmethod
+    def _payload(messages: list[BaseMessage]) -> dict:
+        return {"messages": [{"role": m.type, "content": m.content} for m in messages]}
+
+    @staticmethod
+    def _result(response: httpx.Response) -> ChatResult:
+        if response.status_code == 429:
+            raise RateLimitError(response.text)
+        response.raise_for_status()
+        message = AIMessage(content=response.json()["content"])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._result(httpx.post(self.url, json=self._payload(messages)))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._result(await self.client.post(self.url, json=self._payload(messages)))
+
+
+def http_chat_model(url: str, client: httpx.AsyncClient) -> HttpChatModel:
+    return HttpChatModel(url=url, client=client)
+
+
+# --- Benchmark (offline) ---
+if __name__ == "__main__":
+    import argparse
+    from functools import partial
+
+    parser = argparse.ArgumentParser(description="AgentExecutor against a local fake model server")
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--server-capacity", type=int, default=48)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    async def main():
+        async with FakeModelServer(latency=args.latency, capacity=args.server_capacity) as server:
+            # The "agent" here is the bare model: the executor only needs something with `ainvoke`
+            factory = partial(http_chat_model, server.url)
+            queries = [f"Question #{i}" for i in range(args.queries)]
+            executor_kwargs = {"max_concurrency": args.concurrency, "to_input": str}
+            if args.processes > 1:
+                report = await run_sharded(factory, queries, args.processes, **executor_kwargs)
+            else:
+                async with AgentExecutor(factory, **executor_kwargs) as executor:
+                    report = await executor.run(queries)
+
+        print(json.dumps(report, indent=2))
+        print(f"server: {server.requests} requests over {server.connections} connections, "
+              f"{server.throttled} throttled (429)")
+
+    asyncio.run(main())
@@ -0,0 +1,304 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+
+# --- Fuzzy Knowledge Index ---
+
+_STOPWORDS = {"a", "an", "the", "of", "in", "on", "is", "are", "what", "whats",
+              "like", "tell", "me", "about", "how", "s"}
+
+
+def normalize(text: str) -> str:
+    """Lowercase, punctuation and filler words removed: "What's the weather in London?" → "weather london"."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return " ".join(w for w in words if w not in _STOPWORDS) or text.strip().lower()
+
+
+def _ngrams(text: str, n: int) -> set[str]:
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if `a` and `b` differ by at most one substitution, insertion or deletion."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i + (len(a) == len(b)):] == b[i + 1:]
+
+
+def _token_matches(key_token: str, query_tokens: set[str], typo_min_length: int) -> bool:
+    # Short words ("mars", "earth") must match exactly; longer ones tolerate a single typo
+    if key_token in query_tokens:
+        return True
+    return len(key_token) >= typo_min_length and any(
+        _within_one_edit(key_token, token) for token in query_tokens
+    )
+
+
+class KnowledgeIndex:
+    """
+    Built once from {key: answer}. Lookups try the normalized key first and
+    fall back to character n-gram similarity (Dice coefficient) through an
+    inverted index, so only entries sharing at least one n-gram are scored.
+    An entry is only a fuzzy candidate if every one of its key words appears in
+    the query (exactly, or within one typo for words of `typo_min_length`+
+    characters): "population of mars" must not answer with Earth's population.
+    """
+
+    def __init__(self, entries: dict[str, str], n: int = 3, min_score: float = 0.5, typo_min_length: int = 6):
+        self.n = n
+        self.min_score = min_score
+        self.typo_min_length = typo_min_length
+        self._keys = [normalize(key) for key in entries]
+        self._tokens = [key.split() for key in self._keys]
+        self._answers = list(entries.values())
+        self._exact = {key: i for i, key in enumerate(self._keys)}
+        self._grams = [_ngrams(key, n) for key in self._keys]
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        for i, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings[gram].append(i)
+
+    def lookup(self, query: str) -> tuple[Optional[str], float]:
+        """Returns (answer, score in [0, 1]); (None, best score) below `min_score`."""
+        key = normalize(query)
+        if key in self._exact:
+            return self._answers[self._exact[key]], 1.0
+
+        grams = _ngrams(key, self.n)
+        query_tokens = set(key.split())
+        shared = Counter(i for gram in grams for i in self._postings.get(gram, ()))
+        for i in list(shared):
+            if not all(_token_matches(token, query_tokens, self.typo_min_length) for token in self._tokens[i]):
+                del shared[i]
+        if not shared:
+            return None, 0.0
+        best, score = max(
+            ((i, 2 * count / (len(grams) + len(self._grams[i]))) for i, count in shared.items()),
+            key=lambda item: item[1],
+        )
+        return (self._answers[best], score) if score >= self.min_score else (None, score)
+
+
+# --- Latency Histogram ---
+
+class LatencyHistogram:
+    """Power-of-two millisecond buckets (≤1ms, ≤2ms, ≤4ms, ...) plus exact percentiles."""
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.samples: list[float] = []
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        bound = 1
+        while ms > bound:
+            bound *= 2
+        self.buckets[bound] += 1
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000 if ordered else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "calls": len(self.samples),
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "buckets_ms": {f"<={bound}": count for bound, count in sorted(self.buckets.items())},
+        }
+
+
+# --- Tool Runtime ---
+
+class ToolRuntime:
+    """
+    Registry around the tools handed to `create_agent`:
+    - tools registered with `pure=True` are memoized in an LRU keyed by their arguments,
+      and identical calls already running share one result
+    - every call is timed into a per-tool latency histogram
+    - `aexecute` runs all tool calls of one model turn in parallel
+    """
+
+    def __init__(self, cache_size: int = 1024, max_workers: int = 8):
+        self.cache_size = cache_size
+        self._tools: dict[str, BaseTool] = {}
+        self._pure: set[str] = set()
+        self._cache: OrderedDict = OrderedDict()
+        self._in_flight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.histograms: dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def register(self, tool: BaseTool, pure: bool = False) -> BaseTool:
+        self._tools[tool.name] = tool
+        if pure:
+            self._pure.add(tool.name)
+        return tool
+
+    @property
+    def tools(self) -> list[BaseTool]:
+        """The registered tools wrapped so that agent calls also go through the runtime."""
+        return [
+            StructuredTool(
+                name=tool.name,
+                description=tool.description,
+                args_schema=tool.args_schema,
+                func=lambda _name=tool.name, **kwargs: self.invoke(_name, kwargs),
+                coroutine=lambda _name=tool.name, **kwargs: self.ainvoke(_name, kwargs),
+            )
+            for tool in self._tools.values()
+        ]
+
+    def _record(self, name: str, start: float) -> None:
+        with self._lock:
+            self.histograms[name].record(time.perf_counter() - start)
+
+    def invoke(self, name: str, args: dict) -> Any:
+        if name not in self._pure:
+            start = time.perf_counter()
+            result = self._tools[name].invoke(args)
+            self._record(name, start)
+            return result
+
+        start = time.perf_counter()
+        key = (name, json.dumps(args, sort_keys=True, default=str))
+        # invoke() runs on several pool threads: the LRU, the in-flight table and the
+        # counters are only touched under the lock, the tool itself runs outside it
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                result = self._cache[key]
+                self.histograms[name].record(time.perf_counter() - start)
+                return result
+            shared = self._in_flight.get(key)
+            if shared is None:
+                self.cache_misses += 1
+                owned = self._in_flight[key] = Future()
+            else:
+                self.cache_hits += 1
+
+        if shared is not None:
+            # The same pure call is already running: wait for its result instead of running it twice
+            result = shared.result()
+            self._record(name, start)
+            return result
+
+        try:
+            result = self._tools[name].invoke(args)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            owned.set_exception(e)
+            raise
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            del self._in_flight[key]
+            self.histograms[name].record(time.perf_counter() - start)
+        owned.set_result(result)
+        return result
+
+    async def ainvoke(self, name: str, args: dict) -> Any:
+        # Sync tools run on the runtime's thread pool so they never block the event loop
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self.invoke, name, args)
+
+    async def aexecute(self, message: AIMessage) -> list[ToolMessage]:
+        """Runs every tool call of one model turn concurrently; results keep the call order."""
+        results = await asyncio.gather(
+            *(self.ainvoke(call["name"], call["args"]) for call in message.tool_calls),
+            return_exceptions=True,
+        )
+        return [
+            ToolMessage(
+                content=f"Error: {result!r}" if isinstance(result, Exception) else str(result),
+                tool_call_id=call["id"],
+                name=call["name"],
+                status="error" if isinstance(result, Exception) else "success",
+            )
+            for call, result in zip(message.tool_calls, results)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "tools": {name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    from langchain_core.tools import tool as langchain_tool
+
+    index = KnowledgeIndex({
+        "weather in london": "The weather in London is currently cloudy with a temperature of 15°C.",
+        "capital of france": "The capital of France is Paris.",
+        "population of earth": "The estimated population of Earth is around 8 billion people.",
+    })
+
+    # Near-misses must fall through to "no information", not to a similar-looking entry
+    for query, expected in [
+        ("What's the weather like in London?", "weather in london"),
+        ("capitol of france", "capital of france"),
+        ("population of mars", None),
+        ("weather in paris", None),
+        ("population of earthworms", None),
+        ("weather in londonderry", None),
+    ]:
+        answer, score = index.lookup(query)
+        assert (answer is None) == (expected is None), f"{query!r} -> {answer!r} ({score:.2f})"
+        print(f"lookup {query!r}: {'match' if answer else 'no match'} ({score:.2f})")
+
+    @langchain_tool
+    def search_information(query: str) -> str:
+        """Provides factual information on a given topic."""
+        answer, _ = index.lookup(query)
+        return answer or f"Simulated search result for '{query}': No specific information found."
+
+    @langchain_tool
+    def slow_lookup(item: str) -> str:
+        """Simulates a tool backed by a slow service."""
+        time.sleep(0.3)
+        return f"{item}: in stock"
+
+    runtime = ToolRuntime()
+    runtime.register(search_information, pure=True)
+    runtime.register(slow_lookup)
+
+    turn = AIMessage(content="", tool_calls=[
+        {"name": "search_information", "args": {"query": "What's the weather like in London?"}, "id": "1"},
+        {"name": "search_information", "args": {"query": "capitol of france"}, "id": "2"},
+        {"name": "slow_lookup", "args": {"item": "umbrella"}, "id": "3"},
+        {"name": "slow_lookup", "args": {"item": "raincoat"}, "id": "4"},
+    ])
+
+    async def main():
+        for _ in range(3):
+            start = time.perf_counter()
+            messages = await runtime.aexecute(turn)
+            print(f"{len(messages)} tool calls in {time.perf_counter() - start:.2f}s")
+        for message in messages:
+            print(f"  {message.tool_call_id}: {message.content}")
+        print(json.dumps(runtime.stats(), indent=2))
+
+    asyncio.run(main())
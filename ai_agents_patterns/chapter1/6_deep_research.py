@@ -1,26 +1,41 @@
-import time
-from google import genai
+import asyncio
+import importlib
 
-from dotenv import load_dotenv
+import lazy
 
-load_dotenv()
+# Non-blocking polling of many background interactions lives in 6_deep_research_jobs.py
+deep_research_jobs = importlib.import_module("6_deep_research_jobs")
 
-client = genai.Client()
 
-interaction = client.interactions.create(
-    input="Research the history of Google TPUs.",
-    agent='deep-research-pro-preview-12-2025',
-    background=True
-)
+async def run_deep_research(
+    prompts: list[str],
+    agent: str = deep_research_jobs.DEFAULT_AGENT,
+    store_path: str = "deep_research_jobs.json",
+) -> None:
+    """
+    Starts one background research interaction per prompt and prints each report
+    as soon as it is done. Job IDs are kept in `store_path`: if the script is
+    restarted, the jobs still pending there are resumed instead of resubmitted.
+    """
+    from google import genai
 
-print(f"Research started: {interaction.id}")
+    lazy.load_env()
+    client = genai.Client()
+    manager = deep_research_jobs.ResearchJobManager(client, store_path, agent=agent)
 
-while True:
-    interaction = client.interactions.get(interaction.id)
-    if interaction.status == "completed":
-        print(interaction.outputs[-1].text)
-        break
-    elif interaction.status == "failed":
-        print(f"Research failed: {interaction.error}")
-        break
-    time.sleep(10)
\ No newline at end of file
+    if manager.pending:
+        print(f"Resuming {len(manager.pending)} research job(s) from {store_path}")
+    else:
+        for prompt in prompts:
+            job = await manager.submit(prompt)
+            print(f"Research started: {job.id}")
+
+    async for job in manager.as_completed():
+        if job.status == "completed":
+            print(job.result)
+        else:
+            print(f"Research failed: {job.error}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_deep_research(["Research the history of Google TPUs."]))
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, Optional
+
+DEFAULT_AGENT = "deep-research-pro-preview-12-2025"
+FINISHED = ("completed", "failed", "cancelled")
+
+
+# --- Job State ---
+
+@dataclass
+class Job:
+    id: str
+    prompt: str = ""
+    status: str = "in_progress"
+    submitted_at: float = field(default_factory=time.time)
+    # Not persisted: polling state restarts from `min_interval` after a restart
+    interval: float = 0.0
+    next_poll: float = 0.0
+    polls: int = 0
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_record(self) -> dict:
+        return {"id": self.id, "prompt": self.prompt, "status": self.status, "submitted_at": self.submitted_at}
+
+
+class JobStore:
+    """Pending job IDs in a JSON file, rewritten atomically on every change."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+
+    def load(self) -> list[Job]:
+        if not self.path or not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            return [Job(**record) for record in json.load(f)]
+
+    def save(self, jobs: list[Job]) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump([job.to_record() for job in jobs], f)
+        os.replace(tmp, self.path)  # atomic: a crash leaves either the old or the new file
+
+
+# --- Job Manager ---
+
+class ResearchJobManager:
+    """
+    Tracks many background `client.interactions` jobs from one event loop.
+    - every job has its own poll interval, starting at `min_interval` and growing
+      by `backoff` (with jitter) up to `max_interval` while the job is running
+    - all jobs that are due are polled together, at most `max_concurrent_polls` at once
+    - finished jobs fire `on_complete(job)` and are yielded by `as_completed()`
+    - pending job IDs are persisted to `store_path`, so a new manager resumes them
+    """
+
+    def __init__(
+        self,
+        client,
+        store_path: Optional[str] = None,
+        agent: str = DEFAULT_AGENT,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+        max_concurrent_polls: int = 20,
+        on_complete: Optional[Callable[[Job], None]] = None,
+    ):
+        self.client = client
+        self.agent = agent
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_concurrent_polls = max_concurrent_polls
+        self.on_complete = on_complete
+        self.store = JobStore(store_path)
+        self.pending: dict[str, Job] = {}
+        self.stats = {"polls": 0, "poll_errors": 0, "completed": 0, "failed": 0}
+        for job in self.store.load():
+            self._track(job)
+
+    def _track(self, job: Job) -> Job:
+        job.interval = self.min_interval
+        job.next_poll = time.monotonic() + self.min_interval
+        self.pending[job.id] = job
+        return job
+
+    async def _call(self, method, *args, **kwargs):
+        # google.genai exposes async methods under `client.aio`; otherwise keep the loop free with a thread
+        aio = getattr(getattr(self.client, "aio", None), "interactions", None)
+        if aio is not None:
+            return await getattr(aio, method)(*args, **kwargs)
+        return await asyncio.to_thread(getattr(self.client.interactions, method), *args, **kwargs)
+
+    async def submit(self, prompt: str) -> Job:
+        interaction = await self._call("create", input=prompt, agent=self.agent, background=True)
+        return self.track(interaction.id, prompt)
+
+    def track(self, interaction_id: str, prompt: str = "") -> Job:
+        """Starts tracking an interaction that was created elsewhere."""
+        job = self._track(Job(id=interaction_id, prompt=prompt))
+        self.store.save(list(self.pending.values()))
+        return job
+
+    async def _poll(self, job: Job, semaphore: asyncio.Semaphore) -> bool:
+        """Polls one job; returns True if it finished."""
+        async with semaphore:
+            self.stats["polls"] += 1
+            job.polls += 1
+            try:
+                interaction = await self._call("get", job.id)
+            except Exception:
+                self.stats["poll_errors"] += 1
+                interaction = None
+
+        if interaction is not None and interaction.status in FINISHED:
+            job.status = interaction.status
+            job.finished_at = time.time()
+            outputs = getattr(interaction, "outputs", None) or []
+            if interaction.status == "completed" and outputs:
+                job.result = outputs[-1].text
+            elif interaction.status == "completed":
+                job.status, job.error = "failed", "completed without outputs"
+            else:
+                job.error = str(getattr(interaction, "error", None) or interaction.status)
+            return True
+
+        # Still running (or a transient error): back off, with jitter so jobs submitted together spread out
+        job.interval = min(self.max_interval, job.interval * self.backoff)
+        job.next_poll = time.monotonic() + job.interval * random.uniform(0.8, 1.2)
+        return False
+
+    async def as_completed(self) -> AsyncIterator[Job]:
+        """Polls until no job is pending, yielding each job as soon as it is seen finished."""
+        semaphore = asyncio.Semaphore(self.max_concurrent_polls)
+        while self.pending:
+            now = time.monotonic()
+            due = [job for job in self.pending.values() if job.next_poll <= now]
+            if not due:
+                await asyncio.sleep(min(job.next_poll for job in self.pending.values()) - now)
+                continue
+
+            finished = await asyncio.gather(*(self._poll(job, semaphore) for job in due))
+            done = [job for job, is_done in zip(due, finished) if is_done]
+            if not done:
+                continue
+            for job in done:
+                del self.pending[job.id]
+            self.store.save(list(self.pending.values()))
+            for job in done:
+                self.stats["completed" if job.status == "completed" else "failed"] += 1
+                if self.on_complete:
+                    self.on_complete(job)
+                yield job
+
+    async def run(self) -> list[Job]:
+        """Waits for every pending job (callbacks still fire) and returns them in completion order."""
+        return [job async for job in self.as_completed()]
+
+
+# --- Local Fake Interactions Service (for tests / demos) ---
+
+class _FakeInteractions:
+    def __init__(self, service: "FakeInteractionsService"):
+        self._service = service
+
+    def create(self, input: str, agent: str, background: bool = True):
+        service = self._service
+        interaction_id = f"fake-{len(service.jobs)}"
+        service.jobs[interaction_id] = {
+            "input": input,
+            "done_at": time.time() + random.uniform(*service.duration_range),
+            "fails": random.random() < service.failure_rate,
+        }
+        return self.get(interaction_id, count=False)
+
+    def get(self, interaction_id: str, count: bool = True):
+        service = self._service
+        if count:
+            service.get_calls += 1
+            if random.random() < service.error_rate:
+                raise ConnectionError("transient error")
+        job = service.jobs[interaction_id]
+        if time.time() < job["done_at"]:
+            return SimpleNamespace(id=interaction_id, status="in_progress", outputs=[], error=None)
+        if job["fails"]:
+            return SimpleNamespace(id=interaction_id, status="failed", outputs=[], error="agent error")
+        return SimpleNamespace(
+            id=interaction_id, status="completed", error=None,
+            outputs=[SimpleNamespace(text=f"Report on: {job['input']}")],
+        )
+
+
+class FakeInteractionsService:
+    """Stands in for `genai.Client()`: jobs finish after a random duration, some fail."""
+
+    def __init__(self, duration_range=(1.0, 5.0), failure_rate: float = 0.05, error_rate: float = 0.0):
+        self.duration_range = duration_range
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self.jobs: dict[str, dict] = {}
+        self.get_calls = 0
+        self.interactions = _FakeInteractions(self)
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    import tempfile
+
+    service = FakeInteractionsService(duration_range=(0.5, 6.0), failure_rate=0.05, error_rate=0.02)
+    store_path = os.path.join(tempfile.mkdtemp(), "jobs.json")
+    lags = []
+
+    def record_lag(job: Job) -> None:
+        lags.append(job.finished_at - service.jobs[job.id]["done_at"])
+
+    def new_manager() -> ResearchJobManager:
+        return ResearchJobManager(service, store_path, min_interval=0.25, max_interval=4.0,
+                                  on_complete=record_lag)
+
+    async def main():
+        manager = new_manager()
+        for i in range(300):
+            await manager.submit(f"Research topic #{i}")
+
+        # Simulate a crash after 2 seconds...
+        async def consume():
+            async for _ in manager.as_completed():
+                pass
+        try:
+            await asyncio.wait_for(consume(), timeout=2.0)
+        except asyncio.TimeoutError:
+            pass
+        print(f"before restart: {300 - len(manager.pending)} finished, {len(manager.pending)} pending")
+
+        # ...and resume from the store with a fresh manager
+        start = time.perf_counter()
+        resumed = new_manager()
+        print(f"resumed {len(resumed.pending)} jobs from {store_path}")
+        await resumed.run()
+        print(f"after restart: all done in {time.perf_counter() - start:.2f}s, stats {resumed.stats}")
+
+        lags.sort()
+        print(f"\n{service.get_calls} get() calls for 300 jobs; completion noticed "
+              f"{lags[len(lags) // 2]:.2f}s (p50) / {lags[int(len(lags) * 0.99)]:.2f}s (p99) after it happened")
+        print("(a fixed 10s sleep loop: one process per job, and up to 10s lag)")
+
+    asyncio.run(main())
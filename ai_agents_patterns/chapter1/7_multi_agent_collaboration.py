@@ -1,15 +1,12 @@
 import os
 
-from crewai import Agent, Task, Crew, Process
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-from dotenv import load_dotenv
+import lazy
 
 def setup_environment():
     """
     Loads environment variables and checks for the required API key.
     """
-    load_dotenv()
+    lazy.load_env()
 
     if not os.getenv("GOOGLE_API_KEY"):
         raise ValueError(
@@ -17,39 +14,73 @@ def setup_environment():
         )
 
 
-def main():
+# --- Agent and Task Definitions ---
+# Plain data, so other runners (see 7_multi_agent_pipeline.py) can build the
+# same agents without importing crewai up front. Tasks are templated on {topic}.
+RESEARCHER = {
+    "role": "Senior Research Analyst",
+    "goal": "Find and summarize the latest trends in {topic}.",
+    "backstory": (
+        "You are an experienced research analyst with a knack for "
+        "identifying key trends and synthesizing information."
+    ),
+}
+
+WRITER = {
+    "role": "Technical Content Writer",
+    "goal": "Write a clear and engaging blog post based on research findings.",
+    "backstory": (
+        "You are a skilled writer who can translate complex technical "
+        "topics into accessible content."
+    ),
+}
+
+RESEARCH_TASK = {
+    "description": (
+        "Research the top 3 emerging trends in {topic} "
+        "in 2024–2025. Focus on practical applications and potential impact."
+    ),
+    "expected_output": (
+        "A detailed summary of the top 3 {topic} trends, including key points "
+        "and sources."
+    ),
+}
+
+WRITING_TASK = {
+    "description": (
+        "Write a 500-word blog post based on the research findings. "
+        "The post should be engaging and easy for a general audience "
+        "to understand."
+    ),
+    "expected_output": (
+        "A complete 500-word blog post about the latest {topic} trends."
+    ),
+}
+
+
+def main(topic: str = "Artificial Intelligence"):
     """
     Initializes and runs the AI crew for content creation
     using the Gemini language model.
     """
+    from crewai import Agent, Task, Crew, Process
+
     setup_environment()
 
     # --- Initialize LLM ---
     # Using Gemini 2.0 Flash for strong reasoning + speed
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash"
-    )
+    llm = lazy.gemini("gemini-2.0-flash")
 
     # --- Define Agents ---
     researcher = Agent(
-        role="Senior Research Analyst",
-        goal="Find and summarize the latest trends in AI.",
-        backstory=(
-            "You are an experienced research analyst with a knack for "
-            "identifying key trends and synthesizing information."
-        ),
+        **RESEARCHER,
         verbose=True,
         allow_delegation=False,
         llm=llm,
     )
 
     writer = Agent(
-        role="Technical Content Writer",
-        goal="Write a clear and engaging blog post based on research findings.",
-        backstory=(
-            "You are a skilled writer who can translate complex technical "
-            "topics into accessible content."
-        ),
+        **WRITER,
         verbose=True,
         allow_delegation=False,
         llm=llm,
@@ -57,26 +88,12 @@ def main():
 
     # --- Define Tasks ---
     research_task = Task(
-        description=(
-            "Research the top 3 emerging trends in Artificial Intelligence "
-            "in 2024–2025. Focus on practical applications and potential impact."
-        ),
-        expected_output=(
-            "A detailed summary of the top 3 AI trends, including key points "
-            "and sources."
-        ),
+        **RESEARCH_TASK,
         agent=researcher,
     )
 
     writing_task = Task(
-        description=(
-            "Write a 500-word blog post based on the research findings. "
-            "The post should be engaging and easy for a general audience "
-            "to understand."
-        ),
-        expected_output=(
-            "A complete 500-word blog post about the latest AI trends."
-        ),
+        **WRITING_TASK,
         agent=writer,
         context=[research_task],
     )
@@ -93,7 +110,7 @@ def main():
     print("## Running the blog creation crew with Gemini 2.0 Flash ##\n")
 
     try:
-        result = blog_creation_crew.kickoff()
+        result = blog_creation_crew.kickoff(inputs={"topic": topic})
         print("\n------------------\n")
         print("## Crew Final Output ##\n")
         print(result)
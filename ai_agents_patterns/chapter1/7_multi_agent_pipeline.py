@@ -0,0 +1,287 @@
+import asyncio
+import importlib
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import lazy
+
+# Agent and task definitions live in 7_multi_agent_collaboration.py
+collaboration = importlib.import_module("7_multi_agent_collaboration")
+
+# A stage takes the topic (and, for writing, the research) and returns the task output
+Stage = Callable[..., Awaitable[str]]
+
+
+# --- Stages ---
+
+def crewai_stages(llm) -> tuple[Stage, Stage]:
+    """
+    (research, write) stages backed by crewai. Each call builds a fresh one-task
+    crew, since a Crew keeps per-run state, but all crews share the same `llm`.
+    """
+    from crewai import Agent, Crew, Process, Task
+
+    def crew_for(agent_spec: dict, task_spec: dict, topic: str, extra: str = "") -> Crew:
+        agent = Agent(
+            **{k: v.format(topic=topic) for k, v in agent_spec.items()},
+            allow_delegation=False,
+            llm=llm,
+        )
+        task = Task(
+            # Formatted here rather than via kickoff(inputs=...), so braces in the research text are safe
+            description=task_spec["description"].format(topic=topic) + extra,
+            expected_output=task_spec["expected_output"].format(topic=topic),
+            agent=agent,
+        )
+        return Crew(agents=[agent], tasks=[task], process=Process.sequential)
+
+    async def research(topic: str) -> str:
+        crew = crew_for(collaboration.RESEARCHER, collaboration.RESEARCH_TASK, topic)
+        return (await crew.kickoff_async()).raw
+
+    async def write(topic: str, research: str) -> str:
+        crew = crew_for(collaboration.WRITER, collaboration.WRITING_TASK, topic,
+                        extra=f"\n\nResearch findings:\n{research}")
+        return (await crew.kickoff_async()).raw
+
+    return research, write
+
+
+def stand_in_stages(llm) -> tuple[Stage, Stage]:
+    """
+    Offline stand-ins for the crewai agents: the same role / goal / task text,
+    sent straight to a LangChain chat model (e.g. fake_llm.LocalFakeChatModel).
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    def messages_for(agent_spec: dict, task_spec: dict, topic: str, extra: str = "") -> list:
+        agent = {k: v.format(topic=topic) for k, v in agent_spec.items()}
+        return [
+            SystemMessage(content=f"You are a {agent['role']}. {agent['backstory']} Your goal: {agent['goal']}"),
+            HumanMessage(content=(
+                task_spec["description"].format(topic=topic) + extra
+                + f"\n\nExpected output: {task_spec['expected_output'].format(topic=topic)}"
+            )),
+        ]
+
+    async def research(topic: str) -> str:
+        messages = messages_for(collaboration.RESEARCHER, collaboration.RESEARCH_TASK, topic)
+        return (await llm.ainvoke(messages)).content
+
+    async def write(topic: str, research: str) -> str:
+        messages = messages_for(collaboration.WRITER, collaboration.WRITING_TASK, topic,
+                                extra=f"\n\nResearch findings:\n{research}")
+        return (await llm.ainvoke(messages)).content
+
+    return research, write
+
+
+# --- Research Cache ---
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", topic.lower()))
+
+
+class ResearchCache:
+    """
+    Research output by normalized topic, optionally persisted to a JSON file.
+    Concurrent requests for the same topic share one in-flight research run.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._entries = {key: tuple(entry) for key, entry in json.load(f).items()}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.path)
+
+    async def get_or_run(self, topic: str, research: Stage) -> tuple[str, bool]:
+        """Returns (research output, served from cache)."""
+        key = normalize_topic(topic)
+        while True:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] <= self.ttl_seconds:
+                self.hits += 1
+                return entry[1], True
+            if key not in self._in_flight:
+                break
+            shared = self._in_flight[key]
+            self.hits += 1
+            try:
+                return await asyncio.shield(shared), True
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise  # this waiter itself was cancelled
+                # The task running the research was cancelled: retry, possibly as the new owner
+                self.hits -= 1
+
+        self.misses += 1
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            output = await research(topic)
+            self._entries[key] = (time.time(), output)
+            self._save()
+            future.set_result(output)
+            return output, False
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark as retrieved when no one else is waiting
+            raise
+        finally:
+            # Cancelled (or any other BaseException): release the waiters instead of leaving them hanging
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
+
+
+# --- Pipeline ---
+
+@dataclass
+class TaskTiming:
+    topic: str
+    task: str
+    agent: str
+    start: float  # seconds since the pipeline started
+    end: float
+    cached: bool = False
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class TopicResult:
+    topic: str
+    research: Optional[str] = None
+    post: Optional[str] = None
+    error: Optional[str] = None
+    timings: list[TaskTiming] = field(default_factory=list)
+
+
+class CrewPipeline:
+    """
+    Runs research → writing for many topics at once. The two stages have their
+    own concurrency caps and no barrier between topics, so topic B's research
+    runs while topic A is being written. Research is cached by topic.
+    """
+
+    def __init__(
+        self,
+        research: Stage,
+        write: Stage,
+        max_research: int = 4,
+        max_writing: int = 4,
+        cache: Optional[ResearchCache] = None,
+    ):
+        self.research = research
+        self.write = write
+        self.max_research = max_research
+        self.max_writing = max_writing
+        self.cache = cache or ResearchCache()
+        self.timings: list[TaskTiming] = []
+
+    async def _run_topic(self, topic: str, research_slots, writing_slots, origin: float) -> TopicResult:
+        result = TopicResult(topic)
+
+        def timed(task: str, agent: str, start: float, cached: bool = False) -> None:
+            timing = TaskTiming(topic, task, agent, start - origin, time.perf_counter() - origin, cached)
+            result.timings.append(timing)
+            self.timings.append(timing)
+
+        try:
+            async with research_slots:
+                start = time.perf_counter()
+                result.research, cached = await self.cache.get_or_run(topic, self.research)
+                timed("research", collaboration.RESEARCHER["role"], start, cached)
+
+            async with writing_slots:
+                start = time.perf_counter()
+                result.post = await self.write(topic, result.research)
+                timed("writing", collaboration.WRITER["role"], start)
+        except Exception as e:
+            result.error = repr(e)
+        return result
+
+    def _start(self, topics: list[str]) -> list[Awaitable[TopicResult]]:
+        research_slots = asyncio.Semaphore(self.max_research)
+        writing_slots = asyncio.Semaphore(self.max_writing)
+        origin = time.perf_counter()
+        return [self._run_topic(topic, research_slots, writing_slots, origin) for topic in topics]
+
+    async def iter_results(self, topics: list[str]) -> AsyncIterator[TopicResult]:
+        """Yields each topic's result as soon as its post is written."""
+        for next_done in asyncio.as_completed(self._start(topics)):
+            yield await next_done
+
+    async def run(self, topics: list[str]) -> list[TopicResult]:
+        """Results in the same order as `topics`."""
+        return await asyncio.gather(*self._start(topics))
+
+    def timing_report(self) -> str:
+        """Per-agent / per-task totals. `busy` is summed task time; compare it with the wall time."""
+        groups = defaultdict(list)
+        for t in self.timings:
+            groups[(t.task, t.agent)].append(t)
+        lines = [f"{'task':<10} {'agent':<26} {'runs':>5} {'cached':>7} {'busy s':>8} {'mean s':>7} {'max s':>6}"]
+        for (task, agent), ts in groups.items():
+            busy = sum(t.seconds for t in ts)
+            lines.append(
+                f"{task:<10} {agent:<26} {len(ts):>5} {sum(t.cached for t in ts):>7} "
+                f"{busy:>8.2f} {busy / len(ts):>7.2f} {max(t.seconds for t in ts):>6.2f}"
+            )
+        return "\n".join(lines)
+
+
+def build_crewai_pipeline(**kwargs) -> CrewPipeline:
+    """CrewPipeline over real crewai agents, all sharing one Gemini client."""
+    collaboration.setup_environment()
+    research, write = crewai_stages(lazy.gemini("gemini-2.0-flash"))
+    return CrewPipeline(research, write, **kwargs)
+
+
+# --- Example Usage (offline) ---
+if __name__ == "__main__":
+    from fake_llm import LocalFakeChatModel
+
+    def fake_agent(messages):
+        role = messages[0].content.split(".")[0].removeprefix("You are a ")
+        return f"[{role}] output for: {messages[-1].content.splitlines()[0][:60]}"
+
+    # One shared model client for every agent and every topic
+    llm = LocalFakeChatModel(respond=fake_agent, latency=0.5)
+    research, write = stand_in_stages(llm)
+
+    topics = ["Artificial Intelligence", "Quantum Computing", "Robotics", "Biotech",
+              "artificial intelligence", "Climate Tech", "Space Launch", "Robotics!"]
+
+    async def main():
+        pipeline = CrewPipeline(research, write, max_research=3, max_writing=3)
+        start = time.perf_counter()
+        async for result in pipeline.iter_results(topics):
+            print(f"[{time.perf_counter() - start:5.2f}s] {result.topic}: {result.post or result.error}")
+        wall = time.perf_counter() - start
+
+        print(f"\n{len(topics)} topics in {wall:.2f}s "
+              f"(sequential crews: ~{len(topics) * 2 * llm.latency:.1f}s), {llm.call_count} model calls, "
+              f"research cache hits: {pipeline.cache.hits}\n")
+        print(pipeline.timing_report())
+
+    asyncio.run(main())
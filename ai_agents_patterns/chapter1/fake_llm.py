@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+def _split_tokens(text: str) -> list[str]:
+    words = text.split(" ")
+    return [words[0]] + [" " + word for word in words[1:]]
+
+
+def echo_last_message(messages: list[BaseMessage]) -> str:
+    """Default responder: repeats the last message back."""
+    return f"Echo: {messages[-1].content}"
+
+
+class LocalFakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGoogleGenerativeAI in the pattern examples.
+    Answers with `respond(messages)`, waits `latency` seconds per call plus
+    `token_latency` per generated token (streamed or not) and counts its calls.
+    """
+
+    model: str = "local-fake"
+    temperature: float = 0.0
+    respond: Callable[[list[BaseMessage]], str] = echo_last_message
+    latency: float = 0.0
+    token_latency: float = 0.0
+    call_count: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "local-fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature}
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.call_count += 1
+        content = self.respond(messages)
+        delay = self.latency + self.token_latency * len(_split_tokens(content))
+        if delay:
+            time.sleep(delay)
+        message = AIMessage(content=content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.call_count += 1
+        content = self.respond(messages)
+        delay = self.latency + self.token_latency * len(_split_tokens(content))
+        if delay:
+            await asyncio.sleep(delay)
+        message = AIMessage(content=content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self.call_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        for token in _split_tokens(self.respond(messages)):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        self.call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for token in _split_tokens(self.respond(messages)):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
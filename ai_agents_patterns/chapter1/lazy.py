@@ -0,0 +1,42 @@
+from functools import cache
+from typing import Any, Callable, Optional
+
+# Shared, lazily built resources for the chapter 1 patterns.
+# Importing a pattern module must stay cheap: provider SDKs (langchain_google_genai,
+# google.genai, crewai, langgraph, langchain_community) and `.env` loading are only
+# pulled in when a client or graph is actually needed.
+
+
+@cache
+def load_env() -> None:
+    """Runs load_dotenv() once per process."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@cache
+def gemini(model: str = "gemini-2.5-flash", temperature: Optional[float] = None):
+    """One ChatGoogleGenerativeAI per (model, temperature), built on first use and shared."""
+    load_env()
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    kwargs = {} if temperature is None else {"temperature": temperature}
+    return ChatGoogleGenerativeAI(model=model, **kwargs)
+
+
+def lazy_attributes(module_globals: dict, factories: dict[str, Callable[[], Any]]) -> Callable[[str], Any]:
+    """
+    Returns a module-level __getattr__ (PEP 562) that builds each attribute in
+    `factories` on first access and stores it in the module, so later lookups
+    are plain attribute reads:
+
+        __getattr__ = lazy.lazy_attributes(globals(), {"graph": build_graph})
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in factories:
+            raise AttributeError(f"module {module_globals['__name__']!r} has no attribute {name!r}")
+        value = module_globals[name] = factories[name]()
+        return value
+
+    return __getattr__
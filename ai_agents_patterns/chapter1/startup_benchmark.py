@@ -0,0 +1,107 @@
+"""
+Cold-import benchmark for the chapter 1 patterns.
+
+Every module is imported in a fresh interpreter with `python -X importtime`.
+The script fails (exit code 1) if a module exceeds its time budget or eagerly
+imports one of the heavy stacks that must only load on first use.
+
+    python startup_benchmark.py                 # all pattern modules
+    python startup_benchmark.py --budget-ms 500 2_routing 4_pararelization
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Provider SDKs / frameworks that pattern modules must not import at import time
+HEAVY_MODULES = (
+    "langchain_google_genai",
+    "google.genai",
+    "langgraph",
+    "langchain_community",
+    "langchain.agents",
+    "crewai",
+    "dotenv",
+)
+
+# langchain_core alone (prompts, runnables, messages) costs ~1s cold on a slow box;
+# before the lazy refactor the provider SDKs pushed every pattern past 2s
+DEFAULT_BUDGET_MS = 1_500
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def pattern_modules() -> list[str]:
+    return sorted(
+        name[:-3] for name in os.listdir(HERE)
+        if name[0].isdigit() and name.endswith(".py") and not name.endswith("_benchmark.py")
+    )
+
+
+def measure(module: str, repeat: int = 3) -> dict:
+    """Best-of-`repeat` cumulative import time, plus the heaviest imports and any eager heavy modules."""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import importlib; importlib.import_module({module!r})"],
+            cwd=HERE, capture_output=True, text=True,
+        )
+        entries = [m.groups() for m in map(_LINE.match, proc.stderr.splitlines()) if m]
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+
+        # Top-level entries (no indentation) add up to the total import cost
+        total_us = sum(int(cumulative) for _, cumulative, indent, _ in entries if not indent)
+        if best is None or total_us < best["total_ms"] * 1000:
+            imported = {name for *_, name in entries}
+            best = {
+                "module": module,
+                "total_ms": total_us / 1000,
+                "heaviest": sorted(
+                    ((int(cumulative) / 1000, name) for _, cumulative, indent, name in entries if not indent),
+                    reverse=True,
+                )[:3],
+                "eager_heavy": sorted(
+                    heavy for heavy in HEAVY_MODULES
+                    if any(name == heavy or name.startswith(heavy + ".") for name in imported)
+                ),
+            }
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help="defaults to every numbered pattern module")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<32} {'import ms':>10}  heaviest top-level imports")
+    for module in args.modules or pattern_modules():
+        result = measure(module, args.repeat)
+        if "error" in result:
+            print(f"{module:<32} {'ERROR':>10}  {result['error']}")
+            failed = True
+            continue
+
+        problems = []
+        if result["total_ms"] > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        if result["eager_heavy"]:
+            problems.append(f"eagerly imports {', '.join(result['eager_heavy'])}")
+        failed = failed or bool(problems)
+
+        heaviest = ", ".join(f"{name} {ms:.0f}ms" for ms, name in result["heaviest"])
+        print(f"{module:<32} {result['total_ms']:>10.1f}  {heaviest}")
+        for problem in problems:
+            print(f"{'':<32} {'FAIL':>10}  {problem}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,5 +12,6 @@ def brute_force(arr):
     return max_sum
 
 # Example usage
-array = [-2,1,-3,4,-1,2,1,-5,4]
-print("Maximum subarray sum is:", brute_force(array))
\ No newline at end of file
+if __name__ == "__main__":
+    array = [-2,1,-3,4,-1,2,1,-5,4]
+    print("Maximum subarray sum is:", brute_force(array))
@@ -1,3 +1,11 @@
+import mmap
+import os
+from itertools import islice
+from typing import NamedTuple
+
+import numpy as np
+
+
 def kadanes(arr):
     max_sum = arr[0]
     cur_sum = 0
@@ -10,7 +18,141 @@ def kadanes(arr):
             cur_sum = 0
     return max_sum
 
+
+# --- Streaming / Chunked Variant ---
+# Every block of the input can be described by four numbers:
+#   total  - sum of the whole block
+#   prefix - best sum of a subarray that starts at the block's first element
+#   suffix - best sum of a subarray that ends at the block's last element
+#   best   - best sum of any subarray inside the block
+# Two neighbouring summaries merge associatively, so a huge input can be
+# processed block by block (vectorized with NumPy) without loading it in memory.
+
+class BlockSummary(NamedTuple):
+    total: float
+    prefix: float
+    prefix_end: int
+    suffix: float
+    suffix_start: int
+    best: float
+    best_start: int
+    best_end: int
+
+
+def summarize_block(chunk, offset=0):
+    """Returns the BlockSummary of a 1D NumPy chunk whose first element sits at `offset`."""
+    chunk = np.asarray(chunk)
+    acc_dtype = np.float64 if chunk.dtype.kind == "f" else np.int64
+    prefix_sums = np.cumsum(chunk, dtype=acc_dtype)
+    # before[i] is the sum of everything before position i
+    before = np.concatenate(([0], prefix_sums[:-1])).astype(acc_dtype, copy=False)
+
+    total = prefix_sums[-1]
+    prefix_end = int(np.argmax(prefix_sums))
+    suffix_start = int(np.argmin(before))
+
+    running_min = np.minimum.accumulate(before)
+    best_end = int(np.argmax(prefix_sums - running_min))
+    best_start = int(np.argmin(before[:best_end + 1]))
+
+    return BlockSummary(
+        total=total.item(),
+        prefix=prefix_sums[prefix_end].item(),
+        prefix_end=offset + prefix_end,
+        suffix=(total - before[suffix_start]).item(),
+        suffix_start=offset + suffix_start,
+        best=(prefix_sums[best_end] - before[best_start]).item(),
+        best_start=offset + best_start,
+        best_end=offset + best_end,
+    )
+
+
+def merge_summaries(left, right):
+    """Combines the summaries of two adjacent blocks (`left` comes first)."""
+    prefix, prefix_end = left.prefix, left.prefix_end
+    if left.total + right.prefix > prefix:
+        prefix, prefix_end = left.total + right.prefix, right.prefix_end
+
+    suffix, suffix_start = right.suffix, right.suffix_start
+    if right.total + left.suffix > suffix:
+        suffix, suffix_start = right.total + left.suffix, left.suffix_start
+
+    best, best_start, best_end = left.best, left.best_start, left.best_end
+    if right.best > best:
+        best, best_start, best_end = right.best, right.best_start, right.best_end
+    if left.suffix + right.prefix > best:
+        best = left.suffix + right.prefix
+        best_start, best_end = left.suffix_start, right.prefix_end
+
+    return BlockSummary(
+        total=left.total + right.total,
+        prefix=prefix,
+        prefix_end=prefix_end,
+        suffix=suffix,
+        suffix_start=suffix_start,
+        best=best,
+        best_start=best_start,
+        best_end=best_end,
+    )
+
+
+def iter_chunks(source, chunk_size=1 << 20, dtype=np.float64):
+    """
+    Yields 1D NumPy chunks from `source`, which may be:
+    - a NumPy array or np.memmap (sliced without copying)
+    - a path to a raw binary file of `dtype` values (memory-mapped)
+    - a bytes-like object or mmap.mmap of `dtype` values
+    - a binary file object opened with open(path, "rb")
+    - any iterable of numbers
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = np.memmap(source, dtype=dtype, mode="r")
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        source = np.frombuffer(source, dtype=dtype)
+
+    if isinstance(source, np.ndarray):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, "read"):
+        item_size = np.dtype(dtype).itemsize
+        while True:
+            data = source.read(chunk_size * item_size)
+            if not data:
+                break
+            yield np.frombuffer(data, dtype=dtype, count=len(data) // item_size)
+    else:
+        iterator = iter(source)
+        while True:
+            chunk = np.fromiter(islice(iterator, chunk_size), dtype=dtype)
+            if not len(chunk):
+                break
+            yield chunk
+
+
+def kadanes_stream(source, chunk_size=1 << 20, dtype=np.float64):
+    """
+    Out-of-core maximum subarray.
+    Returns (max_sum, start, end) where arr[start:end+1] is the best subarray.
+    """
+    result = None
+    offset = 0
+    for chunk in iter_chunks(source, chunk_size, dtype):
+        if not len(chunk):
+            continue
+        summary = summarize_block(chunk, offset)
+        result = summary if result is None else merge_summaries(result, summary)
+        offset += len(chunk)
+
+    if result is None:
+        raise ValueError("kadanes_stream() received an empty input")
+    return result.best, result.best_start, result.best_end
+
+
 # Example usage:
-array = [-2,1,-3,4,-1,2,1,-5,4]
-print("Maximum subarray sum is:", kadanes(array))
-# Output: Maximum subarray sum is: 6
\ No newline at end of file
+if __name__ == "__main__":
+    array = [-2,1,-3,4,-1,2,1,-5,4]
+    print("Maximum subarray sum is:", kadanes(array))
+    # Output: Maximum subarray sum is: 6
+
+    print("Streaming result (sum, start, end):", kadanes_stream(iter(array), chunk_size=4, dtype=np.int64))
+    # Output: Streaming result (sum, start, end): (6, 3, 6)
@@ -0,0 +1,80 @@
+# Divide-and-conquer maximum subarray across a process pool.
+# The array lives in one shared memory block, so workers only receive
+# (name, shape, dtype, start, stop) and never pickle the data itself.
+# Each worker returns a BlockSummary (total, prefix, suffix, best) that is
+# combined in a reduction tree with merge_summaries() from kadanes.py.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from kadanes import merge_summaries, summarize_block
+
+
+def _summarize_shared(shm_name, shape, dtype, start, stop):
+    """Worker: attaches to the shared block and summarizes arr[start:stop]."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        return summarize_block(arr[start:stop], start)
+    finally:
+        del arr
+        shm.close()
+
+
+def reduce_tree(summaries):
+    """Merges adjacent summaries pairwise, level by level, until one is left."""
+    level = list(summaries)
+    while len(level) > 1:
+        merged = [merge_summaries(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
+
+
+def parallel_kadanes(arr, workers=None, chunks_per_worker=4, executor=None):
+    """
+    Returns (max_sum, start, end) of the best subarray, splitting the work
+    across `workers` processes. Pass an existing `executor` to reuse a pool.
+    """
+    arr = np.ascontiguousarray(arr)
+    if arr.ndim != 1 or not len(arr):
+        raise ValueError("parallel_kadanes() expects a non-empty 1D array")
+
+    workers = workers or os.cpu_count() or 1
+    n_chunks = min(len(arr), workers * chunks_per_worker)
+    bounds = np.linspace(0, len(arr), n_chunks + 1, dtype=np.int64)
+
+    shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    try:
+        shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        shared[:] = arr
+        del shared
+
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(_summarize_shared, shm.name, arr.shape, arr.dtype.str, int(lo), int(hi))
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            # Results are collected in submission order because the merge is
+            # associative but not commutative.
+            result = reduce_tree(f.result() for f in futures)
+        finally:
+            if executor is None:
+                pool.shutdown()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return result.best, result.best_start, result.best_end
+
+
+# Example usage:
+if __name__ == "__main__":
+    array = np.array([-2, 1, -3, 4, -1, 2, 1, -5, 4])
+    print("Parallel result (sum, start, end):", parallel_kadanes(array, workers=2, chunks_per_worker=2))
+    # Output: Parallel result (sum, start, end): (6, 3, 6)
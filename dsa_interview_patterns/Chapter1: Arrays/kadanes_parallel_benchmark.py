@@ -0,0 +1,55 @@
+# Measures how parallel_kadanes() scales with the number of worker processes
+# compared to the original single-threaded kadanes() loop.
+#
+# Usage:
+#   python kadanes_parallel_benchmark.py [n_elements] [max_workers]
+#   python kadanes_parallel_benchmark.py 50000000 16
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kadanes import kadanes, kadanes_stream
+from kadanes_parallel import parallel_kadanes
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    max_workers = min(max_workers, os.cpu_count() or 1)
+
+    rng = np.random.default_rng(0)
+    arr = rng.integers(-100, 100, size=n, dtype=np.int64)
+    print(f"n = {n:,}, cores available = {os.cpu_count()}")
+
+    baseline, expected = timed(kadanes, arr.tolist())
+    print(f"{'kadanes() loop':<26} {baseline:8.3f}s  speedup  1.00x")
+
+    elapsed, (best, _, _) = timed(kadanes_stream, arr)
+    assert best == expected
+    print(f"{'kadanes_stream()':<26} {elapsed:8.3f}s  speedup {baseline / elapsed:5.2f}x")
+
+    workers = 1
+    while workers <= max_workers:
+        # The pool is started outside the timed region so process spawn cost
+        # is not counted against the algorithm.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parallel_kadanes(arr[:workers], workers=workers, executor=pool)
+            elapsed, (best, _, _) = timed(parallel_kadanes, arr, workers=workers, executor=pool)
+        assert best == expected
+        label = f"parallel_kadanes({workers})"
+        print(f"{label:<26} {elapsed:8.3f}s  speedup {baseline / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# Benchmark and regression harness for every pattern in this chapter.
+#
+# For each algorithm it sweeps input sizes from 1e2 up to --max-size, fits an
+# empirical complexity exponent (slope of log(time) over log(n)), and measures
+# throughput at the largest size plus peak memory with tracemalloc.
+# Results are compared against a baseline JSON; the script exits with status 1
+# when throughput drops or peak memory grows past the stored tolerance, and with
+# status 2 when there is no baseline or a case could not be compared against it
+# (missing from the baseline, or measured at different sizes). Baselines depend
+# on the machine, so record one locally (or in CI) before using the gate.
+#
+# Usage:
+#   python patterns_benchmark.py --update-baseline     # record a new baseline
+#   python patterns_benchmark.py                       # compare against it
+#   python patterns_benchmark.py --max-size 1e5 --only kadanes target_sum
+
+import argparse
+import importlib.util
+import json
+import math
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE / "patterns_benchmark_baseline.json"
+# Tiny peaks (a few hundred bytes) jitter between runs, so allow this much on top of the tolerance
+MEMORY_SLACK_BYTES = 1024
+# Even median CPU times of unchanged code swing by ~35% run to run on a shared box,
+# so the throughput gate only catches real (complexity-class or 2x) regressions.
+# Peak memory is deterministic and keeps a tight tolerance.
+DEFAULT_THROUGHPUT_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.25
+
+
+def load_module(filename):
+    """Imports a file from this folder by path (some names, like brute_force(On^2).py, are not valid module names)."""
+    path = HERE / filename
+    spec = importlib.util.spec_from_file_location(path.stem.split("(")[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+brute_force_mod = load_module("brute_force(On^2).py")
+kadanes_mod = load_module("kadanes.py")
+prefix_sum_mod = load_module("prefix_sum.py")
+two_pointers_mod = load_module("two_pointers.py")
+variables_mod = load_module("sliding_window_variables.py")
+fixed_mod = load_module("sliding_window_fixed.py")
+
+
+# --- Input Generators ---
+# Each returns the positional arguments for one call, built outside the timed region.
+
+def random_ints(n):
+    rng = random.Random(n)
+    return ([rng.randint(-100, 100) for _ in range(n)],)
+
+
+def sorted_ints_no_pair(n):
+    return (list(range(n)), -1)
+
+
+def runs_of_values(n):
+    rng = random.Random(n)
+    return ([i // rng.randint(1, 8) for i in range(n)],)
+
+
+def positive_ints_with_target(n):
+    rng = random.Random(n)
+    arr = [rng.randint(1, 10) for _ in range(n)]
+    return (sum(arr) // 2, arr)
+
+
+def distinct_values(k):
+    def make(n):
+        return (list(range(n)), k)
+    return make
+
+
+# name -> (callable, input generator, largest size it is allowed to run at)
+CASES = {
+    "brute_force": (brute_force_mod.brute_force, random_ints, 3_000),
+    "kadanes": (kadanes_mod.kadanes, random_ints, None),
+    "PrefixSum": (prefix_sum_mod.PrefixSum, random_ints, None),
+    "target_sum": (two_pointers_mod.target_sum, sorted_ints_no_pair, None),
+    "longest_uniform_subarray": (variables_mod.longest_uniform_subarray, runs_of_values, None),
+    "min_subarray_length": (variables_mod.min_subarray_length, positive_ints_with_target, None),
+    "sliding_window_fixed": (fixed_mod.sliding_window_fixed, distinct_values(100), None),
+    "sliding_window_fixed_2": (fixed_mod.sliding_window_fixed_2, distinct_values(100), None),
+    "sliding_window_fixed_brute_force": (fixed_mod.sliding_window_fixed_brute_force, distinct_values(100), 100_000),
+}
+
+
+def sizes_up_to(max_size):
+    """Half-decade steps: 1e2, 3e2, 1e3, 3e3, ..."""
+    sizes = []
+    exponent = 2.0
+    while 10 ** exponent <= max_size * 1.0001:
+        sizes.append(int(round(10 ** exponent, -int(exponent) + 1)))
+        exponent += 0.5
+    return sizes
+
+
+def time_call(fn, args, min_time=0.5, min_repeats=5, max_repeats=25):
+    """
+    Returns the median CPU time of repeated calls: at least `min_repeats`, then
+    more until `min_time` seconds were spent (up to `max_repeats`). Process time
+    ignores time stolen by other processes, and the median ignores outlier calls.
+    """
+    times = []
+    while len(times) < max_repeats and (len(times) < min_repeats or sum(times) < min_time):
+        start = time.process_time()
+        fn(*args)
+        times.append(time.process_time() - start)
+    return statistics.median(times)
+
+
+def peak_memory(fn, args):
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def fit_exponent(sizes, times):
+    """Slope of log(time) vs log(n): ~1 for O(n), ~2 for O(n^2)."""
+    points = [(s, t) for s, t in zip(sizes, times) if t > 0 and s >= 1_000]
+    if len(points) < 2:
+        points = list(zip(sizes, times))
+    if len(points) < 2:
+        return None
+    xs, ys = zip(*points)
+    slope, _ = np.polyfit(np.log(xs), np.log(ys), 1)
+    return float(slope)
+
+
+def complexity_label(exponent):
+    if exponent is None:
+        return "?"
+    labels = {0: "O(1)", 1: "O(n)", 2: "O(n^2)", 3: "O(n^3)"}
+    nearest = min(labels, key=lambda e: abs(e - exponent))
+    return labels[nearest]
+
+
+def run_case(fn, make_args, max_size, memory_size):
+    sizes = sizes_up_to(max_size)
+    times = []
+    for n in sizes:
+        times.append(time_call(fn, make_args(n)))
+
+    exponent = fit_exponent(sizes, times)
+    mem_n = min(memory_size, sizes[-1])
+    return {
+        "sizes": sizes,
+        "seconds": times,
+        "exponent": exponent,
+        "complexity": complexity_label(exponent),
+        "throughput": sizes[-1] / times[-1],
+        "memory_size": mem_n,
+        "peak_memory_bytes": peak_memory(fn, make_args(mem_n)),
+    }
+
+
+def compare(results, baseline):
+    """Returns (human-readable regressions, cases that could not be compared, with the reason)."""
+    tolerance = baseline.get("tolerance", {})
+    max_slowdown = tolerance.get("throughput", DEFAULT_THROUGHPUT_TOLERANCE)
+    max_growth = tolerance.get("peak_memory", DEFAULT_MEMORY_TOLERANCE)
+    failures = []
+    skipped = []
+
+    for name, result in results.items():
+        expected = baseline.get("results", {}).get(name)
+        if expected is None:
+            skipped.append(f"{name}: not in the baseline")
+            continue
+        if expected["sizes"][-1] != result["sizes"][-1] or expected["memory_size"] != result["memory_size"]:
+            skipped.append(
+                f"{name}: measured at n={result['sizes'][-1]:,} / {result['memory_size']:,}, "
+                f"baseline at n={expected['sizes'][-1]:,} / {expected['memory_size']:,}"
+            )
+            continue
+        if result["throughput"] < expected["throughput"] * (1 - max_slowdown):
+            failures.append(
+                f"{name}: throughput {result['throughput']:,.0f}/s "
+                f"< baseline {expected['throughput']:,.0f}/s (-{max_slowdown:.0%} allowed)"
+            )
+        if result["peak_memory_bytes"] > expected["peak_memory_bytes"] * (1 + max_growth) + MEMORY_SLACK_BYTES:
+            failures.append(
+                f"{name}: peak memory {result['peak_memory_bytes']:,} B "
+                f"> baseline {expected['peak_memory_bytes']:,} B (+{max_growth:.0%} allowed)"
+            )
+    return failures, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Chapter 1 array patterns.")
+    parser.add_argument("--max-size", type=float, default=1e7)
+    parser.add_argument("--memory-size", type=float, default=1e5,
+                        help="input size used for the tracemalloc run")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_THROUGHPUT_TOLERANCE,
+                        help="allowed relative throughput drop, stored with --update-baseline")
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help="allowed relative peak memory growth, stored with --update-baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or CASES:
+        fn, make_args, case_limit = CASES[name]
+        max_size = min(args.max_size, case_limit or math.inf)
+        result = run_case(fn, make_args, max_size, int(args.memory_size))
+        results[name] = result
+        print(
+            f"{name:<34} {result['complexity']:<7} (exp {result['exponent'] or 0:4.2f})  "
+            f"{result['throughput']:>14,.0f} items/s @ n={result['sizes'][-1]:<10,} "
+            f"peak {result['peak_memory_bytes'] / 1024:>10,.1f} KiB @ n={result['memory_size']:,}"
+        )
+
+    if args.update_baseline:
+        data = {
+            "tolerance": {"throughput": args.tolerance, "peak_memory": args.memory_tolerance},
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(data, indent=2))
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        # Baselines are machine-specific and not committed; a gate without one must not pass silently
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+        sys.exit(2)
+
+    failures, skipped = compare(results, json.loads(args.baseline.read_text()))
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    if skipped:
+        # An uncompared case is not a passed one: re-record the baseline with the same sizes
+        print("\nNOT COMPARED (run with the baseline's --max-size / --memory-size, or --update-baseline):")
+        for reason in skipped:
+            print(f"  {reason}")
+        sys.exit(2)
+    print(f"\nNo regressions against the baseline ({len(results)} cases compared).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+from array import array
+
+import numpy as np
+
+
 class PrefixSum:
     def __init__(self, arr):
         self.prefix_sum = [0] * (len(arr) + 1)
@@ -8,9 +13,177 @@ class PrefixSum:
         """Returns the sum of the subarray arr[left:right+1]."""
         return self.prefix_sum[right + 1] - self.prefix_sum[left]
 
+
+# --- Fenwick (Binary Indexed) Tree Variant ---
+# Same range_sum() API as PrefixSum, but a single element can change in
+# O(log n) instead of rebuilding everything. Values are stored as packed
+# 64-bit ints in array('q') (8 bytes each) instead of a list of Python ints.
+
+class FenwickPrefixSum:
+    def __init__(self, arr=()):
+        # tree[0] is unused so that index i covers (i - lowbit(i), i]
+        self.tree = array("q", [0])
+        self.tree.extend(arr)
+        n = len(self.tree) - 1
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    def _prefix(self, count):
+        """Returns the sum of the first `count` elements."""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count &= count - 1
+        return total
+
+    def update(self, index, delta):
+        """Adds `delta` to arr[index]."""
+        if not 0 <= index < len(self):
+            raise IndexError("FenwickPrefixSum index out of range")
+        i = index + 1
+        n = len(self)
+        while i <= n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def append(self, value):
+        """Appends `value` to the end of the array in O(log n)."""
+        i = len(self) + 1
+        self.tree.append(value + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+
+    def range_sum(self, left, right):
+        """Returns the sum of the subarray arr[left:right+1]."""
+        return self._prefix(right + 1) - self._prefix(left)
+
+    def _prefix_many(self, counts):
+        # Walks all queries down the tree together: one NumPy step per bit.
+        tree = np.frombuffer(self.tree, dtype=np.int64)
+        totals = np.zeros(len(counts), dtype=np.int64)
+        counts = counts.copy()
+        while True:
+            active = counts > 0
+            if not active.any():
+                return totals
+            totals[active] += tree[counts[active]]
+            counts &= counts - 1
+
+    def range_sum_many(self, lefts, rights):
+        """Vectorized range_sum() for arrays of `lefts` and `rights`."""
+        lefts = np.asarray(lefts, dtype=np.int64)
+        rights = np.asarray(rights, dtype=np.int64)
+        return self._prefix_many(rights + 1) - self._prefix_many(lefts)
+
+
+# --- N-Dimensional Summed-Area Table ---
+# table[i, j] holds the sum of arr[:i, :j] (one zero row/column of padding per
+# axis), so any box sum needs only 2^d lookups (4 in 2D, 8 in 3D).
+# The table can live in a .npy file and be reopened memory-mapped, which makes
+# a table larger than RAM queryable right after process start.
+
+def _accumulator_dtype(arr):
+    """Picks a dtype wide enough to hold the total of `arr` without overflow."""
+    kind = arr.dtype.kind
+    if kind == "f":
+        return np.dtype(np.float64)
+    if kind == "c":
+        return np.dtype(np.complex128)
+    if kind not in "biu":
+        raise TypeError(f"Unsupported dtype for prefix sums: {arr.dtype}")
+
+    acc = np.dtype(np.uint64 if kind == "u" else np.int64)
+    if arr.size:
+        largest = max(abs(int(arr.min())), abs(int(arr.max())))
+        if largest * arr.size > np.iinfo(acc).max:
+            raise OverflowError(
+                f"Sums of {arr.size} values up to {largest} do not fit in {acc}"
+            )
+    return acc
+
+
+class PrefixSumND:
+    def __init__(self, arr, path=None):
+        """
+        Builds the summed-area table of `arr`.
+        If `path` is given the table is written straight into a memory-mapped
+        .npy file instead of RAM.
+        """
+        arr = np.asarray(arr)
+        dtype = _accumulator_dtype(arr)
+        shape = tuple(n + 1 for n in arr.shape)
+
+        if path is None:
+            table = np.zeros(shape, dtype=dtype)
+        else:
+            table = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+            table[...] = 0
+
+        table[(slice(1, None),) * arr.ndim] = arr
+        for axis in range(arr.ndim):
+            np.cumsum(table, axis=axis, out=table)
+
+        if path is not None:
+            table.flush()
+        self.table = table
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """Reopens a table saved with save() (or built with `path=`) without rebuilding it."""
+        ps = cls.__new__(cls)
+        ps.table = np.load(path, mmap_mode=mmap_mode)
+        return ps
+
+    def save(self, path):
+        np.save(path, self.table)
+
+    @property
+    def ndim(self):
+        return self.table.ndim
+
+    def range_sum(self, lo, hi):
+        """Returns the sum of the box arr[lo[0]:hi[0]+1, lo[1]:hi[1]+1, ...]."""
+        return self.range_sum_many([lo], [hi])[0]
+
+    def range_sum_many(self, los, his):
+        """
+        Vectorized range_sum() for `los` and `his` of shape (queries, ndim).
+        Loops only over the 2^ndim corners, never over the queries.
+        """
+        los = np.asarray(los, dtype=np.int64).reshape(-1, self.ndim)
+        his = np.asarray(his, dtype=np.int64).reshape(-1, self.ndim) + 1
+
+        totals = np.zeros(len(los), dtype=self.table.dtype)
+        for corner in range(1 << self.ndim):
+            picks_lo = [(corner >> axis) & 1 for axis in range(self.ndim)]
+            index = tuple(
+                los[:, axis] if pick else his[:, axis]
+                for axis, pick in enumerate(picks_lo)
+            )
+            if sum(picks_lo) % 2:
+                totals -= self.table[index]
+            else:
+                totals += self.table[index]
+        return totals
+
+
 # Example usage:
 if __name__ == "__main__":
     arr = [1, 2, 3, 4, 5]
     ps = PrefixSum(arr)
     print(ps.range_sum(1, 3))  # Output: 9 (2 + 3 + 4)
-    print(ps.range_sum(0, 4))  # Output: 15 (1 + 2 + 3 + 4 + 5)
\ No newline at end of file
+    print(ps.range_sum(0, 4))  # Output: 15 (1 + 2 + 3 + 4 + 5)
+
+    fps = FenwickPrefixSum(arr)
+    fps.update(2, 10)  # arr[2] becomes 13
+    fps.append(6)
+    print(fps.range_sum(1, 3))  # Output: 19 (2 + 13 + 4)
+    print(fps.range_sum_many([0, 4], [5, 5]))  # Output: [31 11]
+
+    grid = np.arange(12).reshape(3, 4)
+    ps2d = PrefixSumND(grid)
+    print(ps2d.range_sum((1, 1), (2, 2)))  # Output: 30 (5 + 6 + 9 + 10)
+    print(ps2d.range_sum_many([(0, 0), (2, 0)], [(2, 3), (2, 3)]))  # Output: [66 38]
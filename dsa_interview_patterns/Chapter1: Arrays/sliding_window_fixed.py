@@ -2,23 +2,80 @@
 # If there are two elements within an windows
 # of size k that are equal
 
+from numbers import Integral
+
+import numpy as np
+
 arr = [1,2,3,2,3,3]
 
-def sliding_window_fixed(arr, k):
+# Brute force reference: O(n*k)
+def sliding_window_fixed_brute_force(arr, k):
     for l in range(len(arr)):
         for R in range(l+1, min(l+k, len(arr))):
             if arr[l] == arr[R]:
                 return True
     return False
 
+# O(n): remember the last index each value was seen at
+def sliding_window_fixed(arr, k):
+    last_seen = {}
+    for i, value in enumerate(arr):
+        if value in last_seen and i - last_seen[value] < k:
+            return True
+        last_seen[value] = i
+    return False
+
+# O(n) with a set that only ever holds the previous k-1 elements
 def sliding_window_fixed_2(arr, k):
+    if k < 1:
+        return False
     window = set()
     for i in range(len(arr)):
+        if i >= k:
+            # The set never holds duplicates (we would have returned),
+            # so removing by value drops exactly the element leaving the window
+            window.discard(arr[i - k])
         if arr[i] in window:
             return True
         window.add(arr[i])
-        if len(window) > k:
-            window.remove(arr[i - k])
     return False
 
-print(sliding_window_fixed(arr, 3))
\ No newline at end of file
+# NumPy variant for integer arrays: a stable argsort orders equal values by
+# index, so only neighbours in the sorted order need to be compared
+def sliding_window_fixed_numpy(arr, k):
+    arr = np.asarray(arr)
+    order = np.argsort(arr, kind="stable")
+    same_value = arr[order[1:]] == arr[order[:-1]]
+    close_enough = (order[1:] - order[:-1]) < k
+    return bool(np.any(same_value & close_enough))
+
+# Tolerance mode: two integer values within t of each other
+# and within k positions. Buckets of width t+1 hold at most one value each,
+# so only the own and the two neighbouring buckets need to be checked.
+# Integers only: with floats, `value // width` and `abs(a - b) <= t` drift at
+# bucket edges, so float inputs (and a negative t) are rejected, not guessed at.
+def sliding_window_fixed_tolerance(arr, k, t):
+    if not isinstance(t, Integral):
+        raise TypeError(f"t must be an integer, got {t!r}")
+    if t < 0:
+        raise ValueError(f"t must be non-negative, got {t}")
+    if k < 1:
+        return False
+    width = t + 1
+    buckets = {}
+    for i, value in enumerate(arr):
+        if not isinstance(value, Integral):
+            raise TypeError(f"tolerance mode needs integer values, got {value!r} at index {i}")
+        if i >= k:
+            del buckets[arr[i - k] // width]
+        bucket = value // width
+        if bucket in buckets:
+            return True
+        for neighbour in (bucket - 1, bucket + 1):
+            if neighbour in buckets and abs(buckets[neighbour] - value) <= t:
+                return True
+        buckets[bucket] = value
+    return False
+
+if __name__ == "__main__":
+    print(sliding_window_fixed(arr, 3))
@@ -0,0 +1,75 @@
+# Checks every nearby-duplicate variant in sliding_window_fixed.py against
+# the brute force reference on random inputs, then times them.
+#
+# Usage:
+#   python sliding_window_fixed_benchmark.py [n_elements] [k]
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from sliding_window_fixed import (
+    sliding_window_fixed,
+    sliding_window_fixed_2,
+    sliding_window_fixed_brute_force,
+    sliding_window_fixed_numpy,
+    sliding_window_fixed_tolerance,
+)
+
+VARIANTS = {
+    "brute_force": sliding_window_fixed_brute_force,
+    "last_seen_dict": sliding_window_fixed,
+    "set_window": sliding_window_fixed_2,
+    "numpy_argsort": sliding_window_fixed_numpy,
+}
+
+
+def tolerance_brute_force(arr, k, t):
+    return any(
+        abs(arr[i] - arr[j]) <= t
+        for i in range(len(arr))
+        for j in range(i + 1, min(i + k, len(arr)))
+    )
+
+
+def check_correctness(trials=2000, seed=0):
+    rng = random.Random(seed)
+    for _ in range(trials):
+        arr = [rng.randint(-20, 20) for _ in range(rng.randint(0, 40))]
+        k = rng.randint(0, 10)
+        t = rng.randint(0, 5)
+        expected = sliding_window_fixed_brute_force(arr, k)
+        for name, fn in VARIANTS.items():
+            assert fn(arr, k) == expected, (name, arr, k)
+        assert sliding_window_fixed_tolerance(arr, k, t) == tolerance_brute_force(arr, k, t), (arr, k, t)
+    print(f"All variants agree with the brute force on {trials} random inputs")
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 200_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    check_correctness()
+
+    # Distinct values: the worst case, every variant has to scan the whole array
+    arr = np.random.default_rng(0).permutation(n)
+    arr_list = arr.tolist()
+    print(f"\nn = {n:,}, k = {k:,} (no duplicates, full scan)")
+    for name, fn in VARIANTS.items():
+        if name == "brute_force" and n * k > 5e8:
+            print(f"{name:<16} skipped (n*k too large)")
+            continue
+        data = arr if name == "numpy_argsort" else arr_list
+        print(f"{name:<16} {timed(fn, data, k):8.4f}s")
+    print(f"{'tolerance(t=0)':<16} {timed(sliding_window_fixed_tolerance, arr_list, k, 0):8.4f}s")
+
+
+if __name__ == "__main__":
+    main()
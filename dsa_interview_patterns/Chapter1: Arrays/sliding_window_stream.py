@@ -0,0 +1,148 @@
+# A reusable sliding window over an unbounded stream of events.
+# The window is either the last `size` events or the events from the last
+# `duration` seconds. Every aggregate is updated in O(1) amortized per event:
+# - sum / mean: running total
+# - min / max:  monotonic deques (each value is pushed and popped at most once)
+# - distinct / duplicates: value -> count dict plus a counter of repeated values
+
+import time
+from collections import deque
+
+
+class SlidingWindow:
+    __slots__ = (
+        "size", "duration", "_values", "_times", "_next_seq",
+        "_sum", "_min", "_max", "_counts", "_repeated",
+    )
+
+    def __init__(self, size=None, duration=None):
+        if (size is None) == (duration is None):
+            raise ValueError("Pass exactly one of `size` or `duration`")
+        if size is not None and size < 1:
+            raise ValueError("`size` must be at least 1")
+
+        self.size = size
+        self.duration = duration
+        self._values = deque()
+        self._times = deque()
+        self._next_seq = 0
+        self._sum = 0
+        self._min = deque()  # (seq, value), values increasing
+        self._max = deque()  # (seq, value), values decreasing
+        self._counts = {}
+        self._repeated = 0  # number of values that occur more than once
+
+    def __len__(self):
+        return len(self._values)
+
+    def _evict_oldest(self):
+        seq = self._next_seq - len(self._values)
+        value = self._values.popleft()
+        if self.duration is not None:
+            self._times.popleft()
+
+        self._sum -= value
+        if self._min[0][0] == seq:
+            self._min.popleft()
+        if self._max[0][0] == seq:
+            self._max.popleft()
+
+        count = self._counts[value] - 1
+        if count == 1:
+            self._repeated -= 1
+        if count:
+            self._counts[value] = count
+        else:
+            del self._counts[value]
+
+    def expire(self, now=None):
+        """Drops events older than `duration` seconds (time-based windows only)."""
+        if self.duration is None:
+            return
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.duration
+        while self._times and self._times[0] <= cutoff:
+            self._evict_oldest()
+
+    def push(self, value, timestamp=None):
+        """
+        Adds one event and evicts whatever falls out of the window.
+        Returns True if `value` was already inside the window (a duplicate).
+        """
+        if self.duration is not None:
+            timestamp = time.monotonic() if timestamp is None else timestamp
+            self.expire(timestamp)
+            self._times.append(timestamp)
+        elif len(self._values) == self.size:
+            self._evict_oldest()
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._values.append(value)
+        self._sum += value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+
+        count = self._counts.get(value, 0) + 1
+        self._counts[value] = count
+        if count == 2:
+            self._repeated += 1
+        return count > 1
+
+    def consume(self, events):
+        """
+        Pushes every event from an (unbounded) iterator and yields
+        (value, is_duplicate) per event. Time-based windows expect
+        (timestamp, value) pairs.
+        """
+        if self.duration is None:
+            for value in events:
+                yield value, self.push(value)
+        else:
+            for timestamp, value in events:
+                yield value, self.push(value, timestamp)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def mean(self):
+        return self._sum / len(self._values) if self._values else None
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def distinct(self):
+        return len(self._counts)
+
+    @property
+    def has_duplicates(self):
+        return self._repeated > 0
+
+
+# Example usage:
+if __name__ == "__main__":
+    window = SlidingWindow(size=3)
+    for value, is_duplicate in window.consume([1, 2, 3, 2, 5, 1]):
+        print(
+            f"value={value} duplicate={is_duplicate} sum={window.sum} "
+            f"min={window.min} max={window.max} distinct={window.distinct}"
+        )
+    # Last line: value=1 duplicate=False sum=8 min=1 max=5 distinct=3
+
+    timed = SlidingWindow(duration=10)
+    events = [(0, 4), (3, 7), (9, 4), (14, 1)]
+    print([dup for _, dup in timed.consume(events)], timed.sum)
+    # Output: [False, False, True, False] 5
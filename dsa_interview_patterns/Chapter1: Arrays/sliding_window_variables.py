@@ -36,7 +36,8 @@ def min_subarray_length(target, arr):
 
 
 # Example usage
-array = [1, 1, 2, 2, 2, 3, 3, 3, 3, 3]
-result = longest_uniform_subarray(array)
-print(f"The length of the longest uniform subarray is: {result}")
-# Output: The length of the longest uniform subarray is: 5
\ No newline at end of file
+if __name__ == "__main__":
+    array = [1, 1, 2, 2, 2, 3, 3, 3, 3, 3]
+    result = longest_uniform_subarray(array)
+    print(f"The length of the longest uniform subarray is: {result}")
+    # Output: The length of the longest uniform subarray is: 5
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def target_sum(arr, target):
     left, right = 0, len(arr) - 1
     while left < right:
@@ -10,12 +13,86 @@ def target_sum(arr, target):
             right -= 1
     return None
 
+
+# --- Batch Variant ---
+# Runs the two-pointer search for many targets in lockstep with NumPy.
+# Instead of moving `right` one step at a time, searchsorted() jumps it
+# straight to the last value <= target - arr[left], which is exactly where
+# the single-target loop would stop. Returns the same pair as target_sum().
+
+def target_sum_many(arr, targets):
+    """
+    Returns an int array of shape (len(targets), 2) with the (left, right)
+    indices found for each target, or (-1, -1) when there is no pair.
+    `arr` must be sorted.
+    """
+    arr = np.asarray(arr)
+    targets = np.asarray(targets)
+    result = np.full((len(targets), 2), -1, dtype=np.int64)
+    if len(arr) < 2:
+        return result
+
+    left = np.zeros(len(targets), dtype=np.int64)
+    right = np.full(len(targets), len(arr) - 1, dtype=np.int64)
+    active = np.arange(len(targets))
+
+    while active.size:
+        l, t = left[active], targets[active]
+        r = np.minimum(right[active], np.searchsorted(arr, t - arr[l], side="right") - 1)
+
+        alive = l < r
+        found = alive & (arr[l] + arr[np.maximum(r, 0)] == t)
+        result[active[found]] = np.column_stack((l[found], r[found]))
+
+        keep = alive & ~found
+        active = active[keep]
+        left[active] = l[keep] + 1
+        right[active] = r[keep]
+
+    return result
+
+
+def iter_target_pairs(arr, target):
+    """Yields every (i, j), i < j, with arr[i] + arr[j] == target. `arr` must be sorted."""
+    left, right = 0, len(arr) - 1
+    while left < right:
+        current_sum = arr[left] + arr[right]
+        if current_sum < target:
+            left += 1
+        elif current_sum > target:
+            right -= 1
+        elif arr[left] == arr[right]:
+            # Every index in [left, right] holds the same value
+            for i in range(left, right):
+                for j in range(i + 1, right + 1):
+                    yield (i, j)
+            return
+        else:
+            left_end = left
+            while arr[left_end + 1] == arr[left]:
+                left_end += 1
+            right_start = right
+            while arr[right_start - 1] == arr[right]:
+                right_start -= 1
+            for i in range(left, left_end + 1):
+                for j in range(right_start, right + 1):
+                    yield (i, j)
+            left, right = left_end + 1, right_start - 1
+
+
 # Example usage:
-arr = [1, 2, 3, 4, 6]
-target = 6
-result = target_sum(arr, target)
-
-if result:
-    print(f"Pair found at indices: {result}")
-else:
-    print("No pair found")
+if __name__ == "__main__":
+    arr = [1, 2, 3, 4, 6]
+    target = 6
+    result = target_sum(arr, target)
+
+    if result:
+        print(f"Pair found at indices: {result}")
+    else:
+        print("No pair found")
+
+    print(target_sum_many(arr, [6, 7, 100]).tolist())
+    # Output: [[1, 3], [0, 4], [-1, -1]]
+
+    print(list(iter_target_pairs([1, 2, 2, 3, 3, 4], 5)))
+    # Output: [(0, 5), (1, 3), (1, 4), (2, 3), (2, 4)]